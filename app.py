@@ -3,12 +3,34 @@ KogniCare - AI-Integrated Patient Monitoring System
 Main application entry point
 """
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
 from src.routes import main_bp, api_bp
 from src.utils import config
 from src.services import vitals_simulator
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson
+
+    The probability-heavy /api payloads serialize several times faster
+    through orjson than the stdlib encoder, and OPT_SERIALIZE_NUMPY lets
+    NumPy scalars/arrays pass through without tolist() conversions.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 def create_app(config_name=None):
     """Application factory pattern"""
     if config_name is None:
@@ -16,7 +38,11 @@ def create_app(config_name=None):
     
     app = Flask(__name__)
     app.config.from_object(config[config_name])
-    
+
+    # Use orjson for all jsonify/request JSON handling when available
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+
     # Initialize CORS
     CORS(app)
     
@@ -27,16 +53,17 @@ def create_app(config_name=None):
     # Create templates directory if it doesn't exist
     if not os.path.exists('templates'):
         os.makedirs('templates')
-    
+
+    # Start the vitals simulation exactly once per worker instead of
+    # re-checking on every dashboard request
+    vitals_simulator.start_simulation()
+
     return app
 
 def main():
     """Main entry point"""
     app = create_app()
-    
-    # Start the simulation thread when running directly (not via gunicorn)
-    vitals_simulator.start_simulation()
-    
+
     port = app.config.get('PORT', 5000)
     host = app.config.get('HOST', '0.0.0.0')
     debug = app.config.get('DEBUG', False)
@@ -2,9 +2,98 @@
 Bayesian Network Implementation for Medical Diagnosis
 Implements probabilistic reasoning using Bayesian Networks to manage uncertainty in patient health data
 """
-from itertools import product
+from enum import IntEnum
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any, Optional
+import heapq
 import json
+import operator
+import threading
+
+import numpy as np
+
+def _marginalize_joint(joint_flat, dims, evidence_axes, evidence_vals, query_axis, n_states):
+    """
+    Accumulate per-query-state sums over a flattened joint tensor.
+
+    Written with explicit loops and integer indexing so Numba can compile it
+    to machine code; also runs as plain Python when Numba is unavailable.
+    """
+    probs = np.zeros(n_states)
+    n_vars = dims.shape[0]
+    index = np.zeros(n_vars, dtype=np.int64)
+
+    for flat in range(joint_flat.size):
+        remainder = flat
+        for axis in range(n_vars - 1, -1, -1):
+            index[axis] = remainder % dims[axis]
+            remainder //= dims[axis]
+
+        consistent = True
+        for i in range(evidence_axes.shape[0]):
+            if index[evidence_axes[i]] != evidence_vals[i]:
+                consistent = False
+                break
+
+        if consistent:
+            probs[index[query_axis]] += joint_flat[flat]
+
+    return probs
+
+try:
+    from numba import njit
+    # fastmath allows the accumulation to be reassociated/vectorized; the
+    # summands are all non-negative probabilities so the tolerance impact
+    # is on the order of float ulps
+    _marginalize_joint = njit(cache=True, fastmath=True)(_marginalize_joint)
+    _HAVE_NUMBA = True
+except ImportError:
+    # Without Numba the Python loop would be slower than NumPy slicing,
+    # so inference falls back to the vectorized path instead
+    _HAVE_NUMBA = False
+
+class VitalState(IntEnum):
+    """Discretized vital sign state; values are indices into node states"""
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+class Factor:
+    """Factor over a set of variables, backed by a NumPy probability table"""
+
+    def __init__(self, variables: Tuple[str, ...], table: np.ndarray):
+        self.variables = tuple(variables)
+        self.table = np.asarray(table, dtype=np.float64)
+
+    def restrict(self, variable: str, value_index: int) -> 'Factor':
+        """Restrict the factor to a single value of an observed variable"""
+        if variable not in self.variables:
+            return self
+
+        axis = self.variables.index(variable)
+        new_variables = self.variables[:axis] + self.variables[axis + 1:]
+        return Factor(new_variables, np.take(self.table, value_index, axis=axis))
+
+    def multiply(self, other: 'Factor') -> 'Factor':
+        """Pointwise-multiply two factors, aligning shared variables"""
+        all_variables = list(self.variables)
+        for variable in other.variables:
+            if variable not in all_variables:
+                all_variables.append(variable)
+
+        axis_index = {variable: i for i, variable in enumerate(all_variables)}
+        self_axes = [axis_index[variable] for variable in self.variables]
+        other_axes = [axis_index[variable] for variable in other.variables]
+
+        table = np.einsum(self.table, self_axes, other.table, other_axes,
+                          list(range(len(all_variables))))
+        return Factor(tuple(all_variables), table)
+
+    def sum_out(self, variable: str) -> 'Factor':
+        """Marginalize (sum out) a variable from the factor"""
+        axis = self.variables.index(variable)
+        new_variables = self.variables[:axis] + self.variables[axis + 1:]
+        return Factor(new_variables, self.table.sum(axis=axis))
 
 class BayesianNode:
     """Represents a node in the Bayesian Network"""
@@ -15,28 +104,60 @@ class BayesianNode:
         self.parents = parents or []
         self.children = []
         self.cpt = {}  # Conditional Probability Table
-    
+        self.cpt_array = None  # Compiled ndarray form (parents..., self)
+        self.factor = None  # Built by BayesianNetwork.add_node
+        self._state_index = {state: i for i, state in enumerate(states)}
+        self._parent_state_index = []  # Filled in by BayesianNetwork.add_node
+
     def set_cpt(self, cpt: Dict):
         """Set the Conditional Probability Table for this node"""
         self.cpt = cpt
-    
+        if not self.parents:
+            # Root nodes can be compiled immediately; parented nodes wait
+            # until add_node knows the parents' cardinalities
+            self.cpt_array = np.array([cpt.get(state, 0.0) for state in self.states])
+
+    def set_cpt_array(self, cpt_array: np.ndarray):
+        """Set the CPT directly in compiled ndarray form (axes: parents..., self)"""
+        self.cpt_array = np.asarray(cpt_array, dtype=np.float64)
+
     def add_child(self, child_name: str):
         """Add a child node"""
         if child_name not in self.children:
             self.children.append(child_name)
-    
+
+    def state_name(self, state_index: int) -> str:
+        """Display name for an integer state code"""
+        return self.states[state_index]
+
     def get_probability(self, state: str, parent_values: Dict = None) -> float:
         """Get probability of a state given parent values"""
         if not self.parents:
             # Root node - return marginal probability
+            state_index = self._state_index.get(state)
+            if self.cpt_array is not None:
+                return float(self.cpt_array[state_index]) if state_index is not None else 0.0
             return self.cpt.get(state, 0.0)
-        
+
         if parent_values is None:
             parent_values = {}
-        
+
+        if self.cpt_array is not None:
+            # Index the compiled array directly - no tuple-of-strings hashing
+            try:
+                key = tuple(self._parent_state_index[i][parent_values[parent]]
+                            for i, parent in enumerate(self.parents))
+            except KeyError:
+                # Parent value missing or unknown - uniform distribution
+                return 1.0 / len(self.states)
+            state_index = self._state_index.get(state)
+            if state_index is None:
+                return 0.0
+            return float(self.cpt_array[key + (state_index,)])
+
         # Create key for conditional probability lookup
         key = tuple(parent_values.get(parent, None) for parent in self.parents)
-        
+
         if key in self.cpt:
             return self.cpt[key].get(state, 0.0)
         else:
@@ -49,15 +170,120 @@ class BayesianNetwork:
     def __init__(self):
         self.nodes = {}
         self.evidence = {}
+        self._order = None  # Topological order, built lazily by finalize()
+        self._axis = None
+        self._parent_axes = None
+        self._grid = None  # Cached full-assignment grid, built lazily
     
     def add_node(self, node: BayesianNode):
         """Add a node to the network"""
         self.nodes[node.name] = node
-        
+
         # Update parent-child relationships
         for parent_name in node.parents:
             if parent_name in self.nodes:
                 self.nodes[parent_name].add_child(node.name)
+
+        # Precompute the parent-index permutation for integer CPT lookups
+        node._parent_state_index = [self.nodes[parent]._state_index
+                                    for parent in node.parents]
+
+        # Convert the node's CPT into a factor once, for Variable Elimination
+        node.factor = self._build_factor(node)
+        if node.cpt_array is None:
+            node.cpt_array = node.factor.table
+
+        # Replace the generic get_probability with a closure specialized
+        # for this node's shape, removing the root/parented branch per call
+        self._specialize_probability_lookup(node)
+
+        # Topology changed - recompute the evaluation schedule on next use
+        self._order = None
+        self._grid = None
+
+    def _specialize_probability_lookup(self, node: BayesianNode):
+        """Bind a specialized get_probability closure onto the node"""
+        table = node.cpt_array
+        state_index = node._state_index
+
+        if not node.parents:
+            def get_probability(state, parent_values=None):
+                index = state_index.get(state)
+                return float(table[index]) if index is not None else 0.0
+        else:
+            parents = node.parents
+            parent_index = node._parent_state_index
+            n_states = len(node.states)
+
+            def get_probability(state, parent_values=None):
+                try:
+                    key = tuple(parent_index[i][parent_values[parent]]
+                                for i, parent in enumerate(parents))
+                except (KeyError, TypeError):
+                    # Parent value missing or unknown - uniform distribution
+                    return 1.0 / n_states
+                index = state_index.get(state)
+                if index is None:
+                    return 0.0
+                return float(table[key + (index,)])
+
+        node.get_probability = get_probability
+
+    def finalize(self):
+        """Precompute the topological order and per-node parent axis schedule"""
+        in_degree = {name: len(node.parents) for name, node in self.nodes.items()}
+        ready = [name for name, degree in in_degree.items() if degree == 0]
+        order = []
+
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for child in self.nodes[name].children:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    ready.append(child)
+
+        self._order = order
+        self._axis = {name: i for i, name in enumerate(order)}
+        self._parent_axes = [tuple(self._axis[parent] for parent in self.nodes[name].parents)
+                             for name in order]
+
+    def _assignment_grid(self) -> np.ndarray:
+        """
+        Return every full assignment as one integer array of shape
+        (n_assignments, n_vars), with columns following the topological
+        order. Built once per topology with np.indices instead of a
+        Python-level itertools.product loop over state tuples.
+        """
+        if self._grid is None:
+            if self._order is None:
+                self.finalize()
+            shape = tuple(len(self.nodes[name].states) for name in self._order)
+            self._grid = np.indices(shape).reshape(len(shape), -1).T
+        return self._grid
+
+    def _build_factor(self, node: BayesianNode) -> Factor:
+        """Build a factor from a node's CPT (axes: parents..., self)"""
+        parent_states = [self.nodes[parent].states for parent in node.parents]
+        shape = tuple(len(states) for states in parent_states) + (len(node.states),)
+
+        # CPTs authored directly as arrays need no dict conversion
+        if node.cpt_array is not None and node.cpt_array.shape == shape:
+            return Factor(tuple(node.parents) + (node.name,), node.cpt_array)
+
+        table = np.empty(shape, dtype=np.float64)
+
+        if not node.parents:
+            for i, state in enumerate(node.states):
+                table[i] = node.cpt.get(state, 0.0)
+        else:
+            for key in np.ndindex(*shape[:-1]):
+                parent_values = {parent: parent_states[i][key[i]]
+                                 for i, parent in enumerate(node.parents)}
+                for i, state in enumerate(node.states):
+                    table[key + (i,)] = node.get_probability(state, parent_values)
+
+        return Factor(tuple(node.parents) + (node.name,), table)
     
     def set_evidence(self, evidence: Dict[str, str]):
         """Set evidence (observed values) for inference"""
@@ -68,116 +294,173 @@ class BayesianNetwork:
         self.evidence = {}
     
     def get_marginal_probability(self, query_var: str, query_state: str) -> float:
-        """Calculate marginal probability using enumeration algorithm"""
+        """Calculate marginal probability using Variable Elimination"""
         if query_var not in self.nodes:
             return 0.0
-        
-        # Get all variables except query variable
-        other_vars = [var for var in self.nodes.keys() if var != query_var]
-        
-        total_prob = 0.0
-        
-        # Enumerate all possible assignments to other variables
-        other_states = [self.nodes[var].states for var in other_vars]
-        
-        if not other_states:
-            # Only query variable exists
-            return self.nodes[query_var].get_probability(query_state, self.evidence)
-        
-        for assignment in product(*other_states):
-            # Create full assignment including query state
-            full_assignment = dict(zip(other_vars, assignment))
-            full_assignment[query_var] = query_state
-            
-            # Check if assignment is consistent with evidence
-            consistent = all(
-                var not in self.evidence or self.evidence[var] == full_assignment[var]
-                for var in full_assignment
-            )
-            
-            if consistent:
-                # Calculate joint probability
-                joint_prob = self._calculate_joint_probability(full_assignment)
-                total_prob += joint_prob
-        
-        return total_prob
+
+        if query_var in self.evidence:
+            # Query is already observed - consistent assignments only
+            if self.evidence[query_var] != query_state:
+                return 0.0
+            return self._calculate_evidence_probability()
+
+        result = self._eliminate({query_var}, self.evidence)
+        state_index = self.nodes[query_var].states.index(query_state)
+        return float(result.table[state_index])
+
+    def _relevant_nodes(self, query_vars: set, evidence: Dict[str, str]) -> set:
+        """
+        Find the nodes that can influence a query: the ancestor closure of
+        the query and evidence variables. Everything outside it is
+        d-separated from the query and would only be summed out to 1.
+        """
+        relevant = set()
+        stack = list(query_vars) + list(evidence)
+        while stack:
+            var = stack.pop()
+            if var in relevant or var not in self.nodes:
+                continue
+            relevant.add(var)
+            stack.extend(self.nodes[var].parents)
+        return relevant
+
+    def _eliminate(self, query_vars: set, evidence: Dict[str, str]) -> Factor:
+        """
+        Run Variable Elimination, summing out all hidden variables.
+
+        Returns a factor over query_vars (a 0-d factor if query_vars is empty)
+        holding unnormalized probabilities P(query_vars, evidence).
+        """
+        # Only the ancestor closure of query and evidence matters; barren
+        # descendants always marginalize to 1 and can be skipped outright
+        relevant = self._relevant_nodes(query_vars, evidence)
+
+        # Restrict each relevant node's factor to the observed evidence
+        factors = []
+        for name in relevant:
+            factor = self.nodes[name].factor
+            for var, state in evidence.items():
+                if var in factor.variables:
+                    factor = factor.restrict(var, self.nodes[var].states.index(state))
+            factors.append(factor)
+
+        hidden_vars = [var for var in relevant
+                       if var not in query_vars and var not in evidence]
+
+        # Eliminate hidden variables in min-degree order (smallest product scope first)
+        while hidden_vars:
+            def scope_size(var):
+                scope = set()
+                for factor in factors:
+                    if var in factor.variables:
+                        scope.update(factor.variables)
+                return len(scope)
+
+            var = min(hidden_vars, key=scope_size)
+            hidden_vars.remove(var)
+
+            related = [f for f in factors if var in f.variables]
+            factors = [f for f in factors if var not in f.variables]
+
+            product_factor = related[0]
+            for factor in related[1:]:
+                product_factor = product_factor.multiply(factor)
+
+            factors.append(product_factor.sum_out(var))
+
+        result = factors[0]
+        for factor in factors[1:]:
+            result = result.multiply(factor)
+
+        # Put query variables into a deterministic axis order
+        if len(result.variables) > 1:
+            ordered = tuple(sorted(result.variables))
+            axes = [result.variables.index(var) for var in ordered]
+            result = Factor(ordered, np.transpose(result.table, axes))
+
+        return result
     
     def get_conditional_probability(self, query_var: str, query_state: str) -> float:
         """Calculate conditional probability given evidence P(query|evidence)"""
         if not self.evidence:
             return self.get_marginal_probability(query_var, query_state)
-        
-        # Calculate P(query, evidence)
-        original_evidence = self.evidence.copy()
-        self.evidence[query_var] = query_state
-        
-        numerator = self._calculate_evidence_probability()
-        
-        # Calculate P(evidence)
-        self.evidence = original_evidence
+
+        # Calculate P(evidence) before the evidence dict is touched
         denominator = self._calculate_evidence_probability()
-        
-        # Restore original evidence
-        self.evidence = original_evidence
-        
+
         if denominator == 0:
             return 0.0
-        
+
+        # Calculate P(query, evidence), restoring evidence even on failure
+        original_evidence = self.evidence.copy()
+        self.evidence[query_var] = query_state
+        try:
+            numerator = self._calculate_evidence_probability()
+        finally:
+            self.evidence = original_evidence
+
         return numerator / denominator
-    
+
     def get_all_probabilities(self, query_var: str) -> Dict[str, float]:
         """Get probabilities for all states of a query variable"""
         if query_var not in self.nodes:
             return {}
-        
+
+        # P(evidence) is identical for every query state - compute it once
+        # instead of once per state inside get_conditional_probability
+        denominator = self._calculate_evidence_probability() if self.evidence else 1.0
+
         probabilities = {}
         total = 0.0
-        
-        for state in self.nodes[query_var].states:
-            prob = self.get_conditional_probability(query_var, state)
-            probabilities[state] = prob
-            total += prob
-        
+
+        original_evidence = self.evidence.copy()
+        try:
+            for state in self.nodes[query_var].states:
+                if self.evidence:
+                    self.evidence[query_var] = state
+                    prob = self._calculate_evidence_probability() / denominator if denominator > 0 else 0.0
+                else:
+                    prob = self.get_marginal_probability(query_var, state)
+                probabilities[state] = prob
+                total += prob
+        finally:
+            self.evidence = original_evidence
+
         # Normalize probabilities
         if total > 0:
             probabilities = {state: prob/total for state, prob in probabilities.items()}
-        
+
         return probabilities
     
     def _calculate_joint_probability(self, assignment: Dict[str, str]) -> float:
         """Calculate joint probability of an assignment"""
+        if len(assignment) != len(self.nodes):
+            # Partial assignment - fall back to the per-node dict walk
+            prob = 1.0
+            for var_name, var_state in assignment.items():
+                node = self.nodes[var_name]
+                parent_values = {parent: assignment[parent] for parent in node.parents if parent in assignment}
+                prob *= node.get_probability(var_state, parent_values)
+            return prob
+
+        if self._order is None:
+            self.finalize()
+
+        # Full assignment - walk the precomputed schedule with index arithmetic
+        codes = [self.nodes[name]._state_index[assignment[name]] for name in self._order]
+
         prob = 1.0
-        
-        for var_name, var_state in assignment.items():
-            node = self.nodes[var_name]
-            parent_values = {parent: assignment[parent] for parent in node.parents if parent in assignment}
-            var_prob = node.get_probability(var_state, parent_values)
-            prob *= var_prob
-        
-        return prob
+        for i, name in enumerate(self._order):
+            node = self.nodes[name]
+            index = tuple(codes[axis] for axis in self._parent_axes[i]) + (codes[i],)
+            prob *= node.cpt_array[index]
+
+        return float(prob)
     
     def _calculate_evidence_probability(self) -> float:
-        """Calculate probability of current evidence"""
-        # Get all non-evidence variables
-        non_evidence_vars = [var for var in self.nodes.keys() if var not in self.evidence]
-        
-        if not non_evidence_vars:
-            # All variables have evidence
-            return self._calculate_joint_probability(self.evidence)
-        
-        total_prob = 0.0
-        
-        # Enumerate all possible assignments to non-evidence variables
-        non_evidence_states = [self.nodes[var].states for var in non_evidence_vars]
-        
-        for assignment in product(*non_evidence_states):
-            full_assignment = self.evidence.copy()
-            full_assignment.update(dict(zip(non_evidence_vars, assignment)))
-            
-            joint_prob = self._calculate_joint_probability(full_assignment)
-            total_prob += joint_prob
-        
-        return total_prob
+        """Calculate probability of current evidence via Variable Elimination"""
+        result = self._eliminate(set(), self.evidence)
+        return float(result.table)
     
     def explain_reasoning(self, query_var: str) -> Dict[str, Any]:
         """Provide explanation of Bayesian reasoning process"""
@@ -201,23 +484,27 @@ class BayesianNetwork:
     
     def _generate_reasoning_text(self, query_var: str, probabilities: Dict[str, float]) -> str:
         """Generate human-readable explanation of reasoning"""
-        most_likely = max(probabilities.items(), key=lambda x: x[1])
-        
-        reasoning = f"Based on Bayesian inference with the current evidence:\n\n"
-        
+        # Rank once and reuse: the top entry is also the most likely state
+        ranked = heapq.nlargest(len(probabilities), probabilities.items(),
+                                key=operator.itemgetter(1))
+        most_likely = ranked[0]
+
+        # Collect fragments and join once instead of repeated string appends
+        parts = ["Based on Bayesian inference with the current evidence:\n\n"]
+
         if self.evidence:
-            reasoning += f"Given evidence: {', '.join([f'{k}={v}' for k, v in self.evidence.items()])}\n\n"
-        
-        reasoning += f"Probability distribution for {query_var}:\n"
-        for state, prob in sorted(probabilities.items(), key=lambda x: x[1], reverse=True):
-            reasoning += f"  • {state}: {prob:.3f} ({prob*100:.1f}%)\n"
-        
-        reasoning += f"\nMost likely state: {most_likely[0]} with {most_likely[1]*100:.1f}% probability.\n"
-        
+            parts.append(f"Given evidence: {', '.join([f'{k}={v}' for k, v in self.evidence.items()])}\n\n")
+
+        parts.append(f"Probability distribution for {query_var}:\n")
+        for state, prob in ranked:
+            parts.append(f"  • {state}: {prob:.3f} ({prob*100:.1f}%)\n")
+
+        parts.append(f"\nMost likely state: {most_likely[0]} with {most_likely[1]*100:.1f}% probability.\n")
+
         if self.nodes[query_var].parents:
-            reasoning += f"\nThis probability is influenced by: {', '.join(self.nodes[query_var].parents)}"
-        
-        return reasoning
+            parts.append(f"\nThis probability is influenced by: {', '.join(self.nodes[query_var].parents)}")
+
+        return "".join(parts)
 
 class MedicalBayesianNetwork(BayesianNetwork):
     """Specialized Bayesian Network for medical diagnosis"""
@@ -225,6 +512,140 @@ class MedicalBayesianNetwork(BayesianNetwork):
     def __init__(self):
         super().__init__()
         self._build_medical_network()
+        self._materialize_joint()
+        # Vitals are discretized to 3 bins, so there are at most 3^4 distinct
+        # evidence configurations - repeat queries become O(1) lookups
+        self._infer = lru_cache(maxsize=256)(self._infer_uncached)
+        self._infer_conditions = lru_cache(maxsize=128)(self._infer_conditions_uncached)
+        if _HAVE_NUMBA:
+            # Trigger LLVM compilation of the kernel now, while the network
+            # is being built, so the first real query doesn't pay for it
+            _marginalize_joint(self._joint.ravel(),
+                               np.array(self._joint.shape, dtype=np.int64),
+                               np.empty(0, dtype=np.int64),
+                               np.empty(0, dtype=np.int64),
+                               0, self._joint.shape[0])
+
+    def get_all_probabilities(self, query_var: str) -> Dict[str, float]:
+        """Get probabilities for all states, memoized by evidence configuration"""
+        evidence_key = tuple(sorted(self.evidence.items()))
+        return dict(self._infer(evidence_key, query_var))
+
+    def _materialize_joint(self):
+        """
+        Precompute the full joint distribution tensor.
+
+        The medical network has 8 ternary variables, so the joint fits in a
+        3^8 = 6561 entry array and queries reduce to slicing plus axis sums.
+        """
+        if self._order is None:
+            self.finalize()
+        self._joint_vars = list(self._order)
+        self._joint_axis = dict(self._axis)
+
+        # Evaluate every node's CPT over all assignments in one shot:
+        # fancy-index the compiled array by the grid columns of the node's
+        # parents and itself, then multiply the per-node probability vectors
+        grid = self._assignment_grid()
+        flat = np.ones(grid.shape[0])
+        for i, name in enumerate(self._order):
+            node = self.nodes[name]
+            index = tuple(grid[:, axis] for axis in self._parent_axes[i]) + (grid[:, i],)
+            flat = flat * node.cpt_array[index]
+
+        self._joint = flat.reshape(tuple(len(self.nodes[name].states)
+                                         for name in self._order))
+
+    def _evidence_mask(self, evidence: Dict[str, str]) -> np.ndarray:
+        """
+        Boolean mask over the assignment grid selecting the rows consistent
+        with the evidence. One vectorized comparison per observed variable
+        replaces a per-assignment all(...) generator check.
+        """
+        grid = self._assignment_grid()
+        mask = np.ones(grid.shape[0], dtype=bool)
+        for var, state in evidence.items():
+            mask &= grid[:, self._joint_axis[var]] == self.nodes[var].states.index(state)
+        return mask
+
+    def _infer_uncached(self, evidence_key: Tuple[Tuple[str, str], ...], query_var: str) -> Dict[str, float]:
+        """Answer a query by slicing the precomputed joint tensor"""
+        evidence = dict(evidence_key)
+        if query_var in evidence:
+            # Degenerate query - defer to the general inference path
+            original_evidence = self.evidence
+            self.evidence = evidence
+            try:
+                return super().get_all_probabilities(query_var)
+            finally:
+                self.evidence = original_evidence
+
+        states = self.nodes[query_var].states
+
+        if _HAVE_NUMBA:
+            evidence_axes = np.array([self._joint_axis[var] for var in evidence],
+                                     dtype=np.int64)
+            evidence_vals = np.array([self.nodes[var].states.index(state)
+                                      for var, state in evidence.items()], dtype=np.int64)
+            probs = _marginalize_joint(self._joint.ravel(),
+                                       np.array(self._joint.shape, dtype=np.int64),
+                                       evidence_axes, evidence_vals,
+                                       self._joint_axis[query_var], len(states))
+        else:
+            # Accumulate the evidence-consistent joint entries per query
+            # state - mask and bincount are both branchless ndarray ops
+            mask = self._evidence_mask(evidence)
+            query_codes = self._assignment_grid()[mask, self._joint_axis[query_var]]
+            probs = np.bincount(query_codes, weights=self._joint.ravel()[mask],
+                                minlength=len(states))
+
+        total = probs.sum()
+        if total > 0:
+            probs = probs / total
+
+        return {state: float(probs[i]) for i, state in enumerate(states)}
+
+    def get_inference_cache_info(self):
+        """Expose cache hit/miss statistics for the inference memo"""
+        return self._infer.cache_info()
+
+    # Diagnosis variables reported by update_with_vitals
+    CONDITION_VARS = ("heart_failure", "sepsis", "respiratory_distress", "patient_status")
+
+    def _infer_conditions_uncached(self, evidence_key: Tuple[Tuple[str, str], ...]) -> Dict[str, Dict[str, float]]:
+        """
+        Compute all condition marginals from a single evidence restriction.
+
+        The evidence is shared across the four diagnosis queries, so the
+        joint tensor is sliced once and each query is just one small axis
+        reduction over the shared subtensor.
+        """
+        evidence = dict(evidence_key)
+
+        index = [slice(None)] * len(self._joint_vars)
+        for var, state in evidence.items():
+            index[self._joint_axis[var]] = self.nodes[var].states.index(state)
+        restricted = self._joint[tuple(index)]
+
+        remaining = [var for var in self._joint_vars if var not in evidence]
+
+        marginals = {}
+        for query_var in self.CONDITION_VARS:
+            if query_var in evidence:
+                marginals[query_var] = dict(self._infer(evidence_key, query_var))
+                continue
+
+            query_axis = remaining.index(query_var)
+            probs = restricted.sum(axis=tuple(axis for axis in range(restricted.ndim)
+                                              if axis != query_axis))
+            total = probs.sum()
+            if total > 0:
+                probs = probs / total
+
+            states = self.nodes[query_var].states
+            marginals[query_var] = {state: float(probs[i]) for i, state in enumerate(states)}
+
+        return marginals
     
     def _build_medical_network(self):
         """Build the medical diagnosis Bayesian Network"""
@@ -265,159 +686,112 @@ class MedicalBayesianNetwork(BayesianNetwork):
         })
         self.add_node(rr_node)
         
+        # State index meshes for the conditional CPTs (low=0, normal=1, high=2
+        # for vitals; absent=0, mild=1, severe=2 for conditions). Rows are
+        # assigned by boolean masks from most general to most specific, so
+        # later, more specific assignments override earlier ones.
+
         # Heart Failure Node (depends on heart rate, spo2)
-        hf_node = BayesianNode("heart_failure", ["absent", "mild", "severe"], 
+        hf_node = BayesianNode("heart_failure", ["absent", "mild", "severe"],
                                parents=["heart_rate", "spo2"])
-        hf_cpt = {}
-        
-        # Define conditional probabilities for heart failure
-        for hr_state in ["low", "normal", "high"]:
-            for spo2_state in ["low", "normal", "high"]:
-                key = (hr_state, spo2_state)
-                if hr_state == "high" and spo2_state == "low":
-                    hf_cpt[key] = {"absent": 0.2, "mild": 0.3, "severe": 0.5}
-                elif hr_state == "high" or spo2_state == "low":
-                    hf_cpt[key] = {"absent": 0.4, "mild": 0.4, "severe": 0.2}
-                elif hr_state == "low":
-                    hf_cpt[key] = {"absent": 0.5, "mild": 0.3, "severe": 0.2}
-                else:
-                    hf_cpt[key] = {"absent": 0.8, "mild": 0.15, "severe": 0.05}
-        
-        hf_node.set_cpt(hf_cpt)
+        hr_idx, spo2_idx = np.indices((3, 3))
+        hf_cpt = np.empty((3, 3, 3))
+        hf_cpt[:] = (0.8, 0.15, 0.05)                               # normal ranges
+        hf_cpt[hr_idx == 0] = (0.5, 0.3, 0.2)                       # low heart rate
+        hf_cpt[(hr_idx == 2) | (spo2_idx == 0)] = (0.4, 0.4, 0.2)   # high HR or low SpO2
+        hf_cpt[(hr_idx == 2) & (spo2_idx == 0)] = (0.2, 0.3, 0.5)   # both
+        hf_node.set_cpt_array(hf_cpt)
         self.add_node(hf_node)
-        
+
         # Sepsis Node (depends on temperature, heart rate, respiratory rate)
-        sepsis_node = BayesianNode("sepsis", ["absent", "mild", "severe"], 
+        sepsis_node = BayesianNode("sepsis", ["absent", "mild", "severe"],
                                   parents=["temperature", "heart_rate", "respiratory_rate"])
-        sepsis_cpt = {}
-        
-        for temp_state in ["low", "normal", "high"]:
-            for hr_state in ["low", "normal", "high"]:
-                for rr_state in ["low", "normal", "high"]:
-                    key = (temp_state, hr_state, rr_state)
-                    
-                    # High temp + high HR + high RR = likely sepsis
-                    if temp_state == "high" and hr_state == "high" and rr_state == "high":
-                        sepsis_cpt[key] = {"absent": 0.1, "mild": 0.3, "severe": 0.6}
-                    elif (temp_state == "high" and hr_state == "high") or \
-                         (temp_state == "high" and rr_state == "high"):
-                        sepsis_cpt[key] = {"absent": 0.3, "mild": 0.4, "severe": 0.3}
-                    elif temp_state == "high":
-                        sepsis_cpt[key] = {"absent": 0.6, "mild": 0.3, "severe": 0.1}
-                    else:
-                        sepsis_cpt[key] = {"absent": 0.9, "mild": 0.08, "severe": 0.02}
-        
-        sepsis_node.set_cpt(sepsis_cpt)
+        temp_idx, hr_idx, rr_idx = np.indices((3, 3, 3))
+        sepsis_cpt = np.empty((3, 3, 3, 3))
+        sepsis_cpt[:] = (0.9, 0.08, 0.02)
+        sepsis_cpt[temp_idx == 2] = (0.6, 0.3, 0.1)                 # high temperature
+        sepsis_cpt[(temp_idx == 2) & ((hr_idx == 2) | (rr_idx == 2))] = (0.3, 0.4, 0.3)
+        # High temp + high HR + high RR = likely sepsis
+        sepsis_cpt[(temp_idx == 2) & (hr_idx == 2) & (rr_idx == 2)] = (0.1, 0.3, 0.6)
+        sepsis_node.set_cpt_array(sepsis_cpt)
         self.add_node(sepsis_node)
-        
+
         # Respiratory Distress Node (depends on spo2, respiratory rate)
-        rd_node = BayesianNode("respiratory_distress", ["absent", "mild", "severe"], 
+        rd_node = BayesianNode("respiratory_distress", ["absent", "mild", "severe"],
                               parents=["spo2", "respiratory_rate"])
-        rd_cpt = {}
-        
-        for spo2_state in ["low", "normal", "high"]:
-            for rr_state in ["low", "normal", "high"]:
-                key = (spo2_state, rr_state)
-                
-                if spo2_state == "low" and rr_state == "high":
-                    rd_cpt[key] = {"absent": 0.1, "mild": 0.2, "severe": 0.7}
-                elif spo2_state == "low" or rr_state == "high":
-                    rd_cpt[key] = {"absent": 0.3, "mild": 0.4, "severe": 0.3}
-                elif rr_state == "low":
-                    rd_cpt[key] = {"absent": 0.6, "mild": 0.3, "severe": 0.1}
-                else:
-                    rd_cpt[key] = {"absent": 0.85, "mild": 0.12, "severe": 0.03}
-        
-        rd_node.set_cpt(rd_cpt)
+        spo2_idx, rr_idx = np.indices((3, 3))
+        rd_cpt = np.empty((3, 3, 3))
+        rd_cpt[:] = (0.85, 0.12, 0.03)
+        rd_cpt[rr_idx == 0] = (0.6, 0.3, 0.1)                       # low respiratory rate
+        rd_cpt[(spo2_idx == 0) | (rr_idx == 2)] = (0.3, 0.4, 0.3)   # low SpO2 or high RR
+        rd_cpt[(spo2_idx == 0) & (rr_idx == 2)] = (0.1, 0.2, 0.7)   # both
+        rd_node.set_cpt_array(rd_cpt)
         self.add_node(rd_node)
-        
+
         # Overall Patient Status Node (depends on all conditions)
-        status_node = BayesianNode("patient_status", ["stable", "at_risk", "critical"], 
+        status_node = BayesianNode("patient_status", ["stable", "at_risk", "critical"],
                                   parents=["heart_failure", "sepsis", "respiratory_distress"])
-        status_cpt = {}
-        
-        for hf_state in ["absent", "mild", "severe"]:
-            for sepsis_state in ["absent", "mild", "severe"]:
-                for rd_state in ["absent", "mild", "severe"]:
-                    key = (hf_state, sepsis_state, rd_state)
-                    
-                    # Count severe conditions
-                    severe_count = sum(1 for state in [hf_state, sepsis_state, rd_state] if state == "severe")
-                    mild_count = sum(1 for state in [hf_state, sepsis_state, rd_state] if state == "mild")
-                    
-                    if severe_count >= 2:
-                        status_cpt[key] = {"stable": 0.05, "at_risk": 0.15, "critical": 0.8}
-                    elif severe_count == 1:
-                        status_cpt[key] = {"stable": 0.15, "at_risk": 0.4, "critical": 0.45}
-                    elif mild_count >= 2:
-                        status_cpt[key] = {"stable": 0.3, "at_risk": 0.5, "critical": 0.2}
-                    elif mild_count == 1:
-                        status_cpt[key] = {"stable": 0.6, "at_risk": 0.3, "critical": 0.1}
-                    else:
-                        status_cpt[key] = {"stable": 0.9, "at_risk": 0.08, "critical": 0.02}
-        
-        status_node.set_cpt(status_cpt)
+        condition_idx = np.indices((3, 3, 3))
+        severe_count = (condition_idx == 2).sum(axis=0)
+        mild_count = (condition_idx == 1).sum(axis=0)
+        status_cpt = np.empty((3, 3, 3, 3))
+        status_cpt[:] = (0.9, 0.08, 0.02)
+        status_cpt[mild_count == 1] = (0.6, 0.3, 0.1)
+        status_cpt[mild_count >= 2] = (0.3, 0.5, 0.2)
+        status_cpt[severe_count == 1] = (0.15, 0.4, 0.45)
+        status_cpt[severe_count >= 2] = (0.05, 0.15, 0.8)
+        status_node.set_cpt_array(status_cpt)
         self.add_node(status_node)
     
-    def classify_vital_value(self, vital_name: str, value: float) -> str:
-        """Classify a vital sign value into categorical state"""
-        if vital_name == "heart_rate":
-            if value < 60:
-                return "low"
-            elif value > 100:
-                return "high"
-            else:
-                return "normal"
-        elif vital_name == "spo2":
-            if value < 95:
-                return "low"
-            elif value > 99:
-                return "high"
-            else:
-                return "normal"
-        elif vital_name == "temperature":
-            if value < 36.0:
-                return "low"
-            elif value > 37.5:
-                return "high"
-            else:
-                return "normal"
-        elif vital_name == "respiratory_rate":
-            if value < 12:
-                return "low"
-            elif value > 20:
-                return "high"
-            else:
-                return "normal"
-        
-        return "normal"
-    
+    # Normal ranges used to discretize vitals into low/normal/high states
+    VITAL_THRESHOLDS = {
+        "heart_rate": (60, 100),
+        "spo2": (95, 99),
+        "temperature": (36.0, 37.5),
+        "respiratory_rate": (12, 20)
+    }
+
+    def classify_vital_value(self, vital_name: str, value: float) -> "VitalState":
+        """Classify a vital sign value into a VitalState code"""
+        thresholds = self.VITAL_THRESHOLDS.get(vital_name)
+        if thresholds is None:
+            return VitalState.NORMAL
+
+        if value < thresholds[0]:
+            return VitalState.LOW
+        elif value > thresholds[1]:
+            return VitalState.HIGH
+        else:
+            return VitalState.NORMAL
+
     def update_with_vitals(self, vitals: Dict[str, float]) -> Dict[str, Any]:
         """Update the network with new vital signs and perform inference"""
         # Clear previous evidence
         self.clear_evidence()
-        
-        # Set evidence based on vital signs
+
+        # Classify vitals into integer state codes, then map to display
+        # names once for the evidence dict and the returned classification
         evidence = {}
         for vital_name, value in vitals.items():
             if vital_name in ["heart_rate", "spo2", "temperature", "respiratory_rate"]:
-                evidence[vital_name] = self.classify_vital_value(vital_name, value)
-        
+                code = self.classify_vital_value(vital_name, value)
+                evidence[vital_name] = self.nodes[vital_name].state_name(code)
+
         self.set_evidence(evidence)
-        
-        # Perform inference for medical conditions
-        results = {
-            "vitals_classification": evidence,
-            "heart_failure": self.get_all_probabilities("heart_failure"),
-            "sepsis": self.get_all_probabilities("sepsis"),
-            "respiratory_distress": self.get_all_probabilities("respiratory_distress"),
-            "patient_status": self.get_all_probabilities("patient_status"),
-            "uncertainty_analysis": self._analyze_uncertainty()
-        }
-        
+
+        # Perform inference for all medical conditions in one pass over
+        # the evidence-restricted joint tensor
+        evidence_key = tuple(sorted(evidence.items()))
+        marginals = self._infer_conditions(evidence_key)
+
+        results = {"vitals_classification": evidence}
+        for condition, probabilities in marginals.items():
+            results[condition] = dict(probabilities)
+        results["uncertainty_analysis"] = self._analyze_uncertainty(marginals)
+
         return results
-    
-    def _analyze_uncertainty(self) -> Dict[str, Any]:
+
+    def _analyze_uncertainty(self, marginals: Dict[str, Dict[str, float]] = None) -> Dict[str, Any]:
         """Analyze uncertainty in the current diagnosis"""
         analysis = {
             "confidence_level": "high",
@@ -425,9 +799,12 @@ class MedicalBayesianNetwork(BayesianNetwork):
             "uncertainty_factors": [],
             "recommendations": []
         }
-        
+
         # Check patient status uncertainty
-        status_probs = self.get_all_probabilities("patient_status")
+        if marginals is not None:
+            status_probs = marginals["patient_status"]
+        else:
+            status_probs = self.get_all_probabilities("patient_status")
         max_prob = max(status_probs.values())
         
         if max_prob < 0.6:
@@ -439,7 +816,8 @@ class MedicalBayesianNetwork(BayesianNetwork):
         
         # Identify primary concerns
         for condition in ["heart_failure", "sepsis", "respiratory_distress"]:
-            probs = self.get_all_probabilities(condition)
+            probs = marginals[condition] if marginals is not None \
+                else self.get_all_probabilities(condition)
             if probs.get("severe", 0) > 0.3:
                 analysis["primary_concerns"].append(f"High risk of severe {condition.replace('_', ' ')}")
             elif probs.get("mild", 0) + probs.get("severe", 0) > 0.4:
@@ -456,5 +834,23 @@ class MedicalBayesianNetwork(BayesianNetwork):
         
         return analysis
 
-# Global instance for medical diagnosis
-medical_bayesian_network = MedicalBayesianNetwork()
\ No newline at end of file
+# Global instance for medical diagnosis, constructed lazily so importing
+# this module doesn't pay the CPT/joint-tensor build cost up front
+_medical_bayesian_network = None
+_network_lock = threading.Lock()
+
+def get_medical_bayesian_network() -> MedicalBayesianNetwork:
+    """Return the shared MedicalBayesianNetwork, building it on first use"""
+    global _medical_bayesian_network
+    if _medical_bayesian_network is None:
+        with _network_lock:
+            if _medical_bayesian_network is None:
+                _medical_bayesian_network = MedicalBayesianNetwork()
+    return _medical_bayesian_network
+
+def __getattr__(name):
+    # Keep `medical_bayesian_network` importable for existing callers
+    # without constructing the network eagerly at import time
+    if name == 'medical_bayesian_network':
+        return get_medical_bayesian_network()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,5 +1,8 @@
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, Response, jsonify, request, send_file
 from datetime import datetime
+import hashlib
+import json
+import time
 from src.services import vitals_simulator, ai_assistant, report_generator
 from src.services.uncertainty_service import uncertainty_service
 from src.models import Patient
@@ -19,10 +22,14 @@ patient_info = Patient(
     nurse='Joy'
 ).to_dict()
 
+# Patient info never changes, so serialize it once and serve the raw bytes
+# instead of re-running jsonify on every request
+_patient_info_json = json.dumps(patient_info).encode('utf-8')
+_patient_etag = hashlib.md5(_patient_info_json).hexdigest()
+
 @api_bp.route('/vitals')
 def get_vitals():
     """Get current vital signs"""
-    vitals_simulator.start_simulation()  # Start controlled simulation
     return jsonify(vitals_simulator.get_current_vitals())
 
 @api_bp.route('/health')
@@ -43,7 +50,12 @@ def get_vitals_history():
 @api_bp.route('/patient')
 def get_patient_info():
     """Get patient information"""
-    return jsonify(patient_info)
+    if request.headers.get('If-None-Match') == _patient_etag:
+        return Response(status=304, headers={'ETag': _patient_etag})
+
+    return Response(_patient_info_json, mimetype='application/json',
+                    headers={'ETag': _patient_etag,
+                             'Cache-Control': 'public, max-age=3600'})
 
 @api_bp.route('/alerts')
 def get_alerts():
@@ -87,6 +99,57 @@ def chat_with_ai():
             'details': str(e)
         }), 500
 
+@api_bp.route('/chat/stream', methods=['POST'])
+def chat_with_ai_stream():
+    """Stream the AI assistant's reply as Server-Sent Events"""
+    try:
+        data = request.get_json()
+        user_message = data.get('message', '')
+
+        current_vitals = vitals_simulator.get_current_vitals()
+        alerts = vitals_simulator.get_alerts()
+
+        def generate():
+            for event in ai_assistant.chat_stream(
+                    user_message, patient_info, current_vitals, len(alerts)):
+                yield f"data: {json.dumps(event)}\n\n"
+
+        return Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache',
+                                 'X-Accel-Buffering': 'no'})
+
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to process chat request',
+            'details': str(e)
+        }), 500
+
+@api_bp.route('/chat/batch', methods=['POST'])
+def chat_batch():
+    """Answer multiple chat queries with a single AI call"""
+    try:
+        data = request.get_json()
+        queries = data.get('queries', [])
+
+        # Queries default to the monitored patient's current context
+        current_vitals = vitals_simulator.get_current_vitals()
+        for query in queries:
+            query.setdefault('patient_info', patient_info)
+            query.setdefault('vitals', current_vitals)
+
+        responses = ai_assistant.chat_batch(queries)
+
+        return jsonify({
+            'responses': responses,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to process batch chat request',
+            'details': str(e)
+        }), 500
+
 @api_bp.route('/report/generate', methods=['POST'])
 def generate_patient_report():
     """Generate a PDF patient report"""
@@ -137,18 +200,47 @@ def system_status():
             'details': str(e)
         }), 500
 
+# Short-lived analysis cache: vitals are discretized to 3 bins per sign, so
+# there are only 81 distinct inference inputs and dashboard polling repeats
+# the same configuration many times per change
+_ANALYSIS_CACHE_TTL = 2.0  # seconds
+_analysis_cache = {}
+
+def _classify_vitals_key(vitals):
+    """Canonical cache key from the classified vital signs"""
+    network = uncertainty_service.bayesian_network
+    return tuple(sorted(
+        (name, network.classify_vital_value(name, value))
+        for name, value in vitals.items()
+        if name in ('heart_rate', 'spo2', 'temperature', 'respiratory_rate')
+    ))
+
 @api_bp.route('/bayesian/analysis')
 def get_bayesian_analysis():
     """Get current Bayesian Network analysis of patient state"""
     try:
         current_vitals = vitals_simulator.get_current_vitals()
-        analysis = uncertainty_service.analyze_patient_state(current_vitals, patient_info)
-        
-        return jsonify({
+
+        cache_key = _classify_vitals_key(current_vitals)
+        now = time.monotonic()
+        cached = _analysis_cache.get(cache_key)
+
+        if cached is not None and now - cached[0] < _ANALYSIS_CACHE_TTL:
+            analysis, cache_state = cached[1], 'HIT'
+        else:
+            analysis = uncertainty_service.analyze_patient_state(current_vitals, patient_info)
+            if len(_analysis_cache) >= 128:
+                _analysis_cache.pop(min(_analysis_cache, key=lambda k: _analysis_cache[k][0]))
+            _analysis_cache[cache_key] = (now, analysis)
+            cache_state = 'MISS'
+
+        response = jsonify({
             'timestamp': datetime.now().isoformat(),
             'analysis': analysis,
             'status': 'success'
         })
+        response.headers['X-Cache'] = cache_state
+        return response
     except Exception as e:
         return jsonify({
             'error': 'Failed to perform Bayesian analysis',
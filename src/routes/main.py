@@ -1,23 +1,31 @@
 from flask import Blueprint, render_template, send_from_directory
 import os
-from src.services import vitals_simulator
 
 main_bp = Blueprint('main', __name__)
 
+# Resolve the asset directories once at import instead of rebuilding the
+# paths on every static request
+STATIC_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'static')
+MEDIA_FOLDER = os.path.join(STATIC_FOLDER, 'media')
+
+# Static assets are immutable per deploy - let browsers cache aggressively
+STATIC_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
 @main_bp.route('/')
 def index():
     """Serve the main dashboard"""
-    vitals_simulator.start_simulation()  # Start simulation on first request
     return render_template('index.html')
 
 @main_bp.route('/static/<path:filename>')
 def serve_static(filename):
     """Serve static files"""
-    static_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'static')
-    return send_from_directory(static_folder, filename)
+    response = send_from_directory(STATIC_FOLDER, filename)
+    response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+    return response
 
 @main_bp.route('/static/media/<path:filename>')
 def serve_media(filename):
     """Serve media files"""
-    static_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'static', 'media')
-    return send_from_directory(static_folder, filename)
+    response = send_from_directory(MEDIA_FOLDER, filename)
+    response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+    return response
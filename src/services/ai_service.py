@@ -1,12 +1,77 @@
+import json
+import logging
+import re
+import numpy as np
 import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from src.services.uncertainty_service import uncertainty_service
+from src.utils.config import Config
+
+# Parse API responses with orjson when available - markedly faster than the
+# stdlib decoder on the multi-KB completion payloads OpenRouter returns
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Shared worker pool so Bayesian inference can overlap with the rest of a
+# chat request instead of running strictly before it, without paying a
+# thread spawn per call
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='ai-service')
+
+# Consecutive chat turns usually see effectively unchanged vitals, so the
+# full Bayesian analysis is reused for a short window instead of recomputed
+_ANALYSIS_CACHE_TTL = 30.0  # seconds
+_ANALYSIS_CACHE_MAX = 512
+
+# Whole chat responses are reused briefly when the same question repeats
+# against effectively unchanged vitals - network + LLM latency dominates
+# the request, so even occasional hits save seconds
+_RESPONSE_CACHE_TTL = 60.0  # seconds
+_RESPONSE_CACHE_MAX = 256
+
+# API availability changes rarely; serve /system/status from memory and let a
+# background thread take the network round-trip every five minutes
+_STATUS_TTL = 300.0  # seconds
+
+# Compiled once: questions about the probabilistic reasoning itself get the
+# detailed Bayesian explanation instead of an LLM round trip. Plain
+# alternation (no word boundaries) keeps the original substring semantics,
+# e.g. 'uncertain' still matches 'uncertainty'
+_BAYES_RE = re.compile(r'bayesian|probability|uncertain|confidence|reasoning',
+                       re.IGNORECASE)
+
+# Conditions surfaced in the AI context summary
+_TRACKED = frozenset({'heart_failure', 'sepsis', 'respiratory_distress', 'patient_status'})
+
+# Response timestamps only need second precision, so the formatted string is
+# shared by every call within the same wall-clock second
+_iso_cache = (0, '')
+
+logger = logging.getLogger(__name__)
+
+def _now_iso():
+    """datetime.now().isoformat(timespec='seconds'), cached per second"""
+    global _iso_cache
+    second = int(time.time())
+    if second != _iso_cache[0]:
+        _iso_cache = (second, datetime.now().isoformat(timespec='seconds'))
+    return _iso_cache[1]
 
 class AIAssistant:
     """Enhanced AI chat functionality with Bayesian reasoning for medical diagnosis"""
     
     def __init__(self):
-        self.api_key = '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'
+        # Resolved once from the environment (.env via Config); the
+        # Authorization header below is likewise built a single time
+        self.api_key = Config.OPENROUTER_API_KEY
         self.base_url = 'https://openrouter.ai/api/v1/chat/completions'
         self.model = 'microsoft/phi-3.5-mini-128k-instruct'
         self.uncertainty_service = uncertainty_service
@@ -19,109 +84,423 @@ class AIAssistant:
         4. Offering evidence-based recommendations
         
         Always recommend consulting with a doctor for medical decisions. Provide clear explanations of uncertainty and confidence levels."""
-    
+
+        # One keep-alive session for every OpenRouter call: the pooled TLS
+        # connection is reused across chat turns instead of re-handshaking,
+        # and transient gateway errors are retried with backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.3,
+                              status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+            'HTTP-Referer': 'http://localhost:5000',
+            'X-Title': 'Kognicare Patient Monitoring'
+        })
+
+        # The system message never changes - build the payload dict once
+        self._system_message = {'role': 'system', 'content': self.system_prompt}
+
+        self._analysis_cache = {}
+        self._analysis_cache_lock = threading.Lock()
+        self._response_cache = {}
+        self._response_cache_lock = threading.Lock()
+        self._network_structure = None
+        self._status_cache = {'ts': 0.0, 'value': None}
+
+        # Ordered (predicate, handler) routing for chat messages; the first
+        # matching predicate wins and each handler gathers only what it needs
+        self._routes = [
+            (_BAYES_RE.search, self._handle_bayes_explanation),
+            (lambda message: True, self._handle_llm),
+        ]
+
+    def _response_key(self, user_message, patient_info, current_vitals):
+        """Cache key for a full chat response, or None if not cacheable"""
+        try:
+            vitals_bucket = (
+                round(current_vitals['heart_rate']),
+                round(current_vitals['spo2']),
+                round(current_vitals['temperature'] * 10),
+                round(current_vitals['respiratory_rate'])
+            )
+        except (KeyError, TypeError):
+            return None
+        message_key = re.sub(r'\s+', ' ', user_message.strip().lower())[:200]
+        return ((patient_info or {}).get('name'), vitals_bucket, message_key)
+
+    def _cached_network_structure(self):
+        """Network topology is fixed per model, so fetch it only once"""
+        if self._network_structure is None:
+            self._network_structure = self.uncertainty_service.get_network_structure()
+        return self._network_structure
+
+    def _cached_analysis(self, vitals, patient_info=None):
+        """Memoized analyze_patient_state keyed on quantized vitals
+
+        Vitals are rounded to measurement precision (HR/SpO2/RR to whole
+        units, temperature to 0.1°C), so repeat queries within the TTL map
+        to the same cache entry and skip inference entirely.
+        """
+        try:
+            key = (
+                (patient_info or {}).get('name'),
+                round(vitals['heart_rate']),
+                round(vitals['spo2']),
+                round(vitals['temperature'] * 10),
+                round(vitals['respiratory_rate'])
+            )
+        except (KeyError, TypeError):
+            # Unquantizable vitals - analyze directly without caching
+            return self.uncertainty_service.analyze_patient_state(vitals, patient_info)
+
+        now = time.monotonic()
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.get(key)
+            if cached is not None and now - cached[0] < _ANALYSIS_CACHE_TTL:
+                return cached[1]
+
+        analysis = self.uncertainty_service.analyze_patient_state(vitals, patient_info)
+
+        with self._analysis_cache_lock:
+            if len(self._analysis_cache) >= _ANALYSIS_CACHE_MAX:
+                self._analysis_cache.pop(min(self._analysis_cache,
+                                             key=lambda k: self._analysis_cache[k][0]))
+            self._analysis_cache[key] = (now, analysis)
+
+        return analysis
+
+    def _post(self, payload, timeout, stream=False):
+        """POST a chat payload, serializing with orjson when available
+
+        The session headers already carry the JSON Content-Type, so the
+        pre-encoded bytes can go out directly as data= instead of running
+        the payload through the stdlib encoder inside requests.
+        """
+        if orjson is not None:
+            return self.session.post(self.base_url, data=orjson.dumps(payload),
+                                     timeout=timeout, stream=stream)
+        return self.session.post(self.base_url, json=payload,
+                                 timeout=timeout, stream=stream)
+
     def chat(self, user_message, patient_info, current_vitals, alerts_count):
-        """Process chat message with enhanced Bayesian reasoning capabilities"""
+        """Process chat message with enhanced Bayesian reasoning capabilities
+
+        Messages are routed through the (predicate, handler) table built in
+        __init__: explanation questions are answered locally from the
+        network, everything else takes the full LLM path.
+        """
         try:
-            # Perform Bayesian analysis of current vitals
-            bayesian_analysis = self.uncertainty_service.analyze_patient_state(current_vitals, patient_info)
-            
-            # Extract key insights for AI context
-            uncertainty_metrics = bayesian_analysis.get("uncertainty_metrics", {})
-            risk_assessment = bayesian_analysis.get("risk_assessment", {})
-            recommendations = bayesian_analysis.get("recommendations", [])
+            for predicate, handler in self._routes:
+                if predicate(user_message):
+                    return handler(user_message, patient_info, current_vitals, alerts_count)
+
+        except Exception as e:
+            return {
+                'error': 'Failed to process chat request',
+                'details': str(e),
+                'fallback_response': self._basic_fallback_response(user_message, current_vitals, patient_info)
+            }
+
+    def _handle_bayes_explanation(self, user_message, patient_info, current_vitals, alerts_count):
+        """Answer reasoning questions from the network - no LLM round trip"""
+        # The reasoning walk overlaps with the in-flight analysis
+        analysis_future = _EXECUTOR.submit(
+            self._cached_analysis, current_vitals, patient_info)
+        bayesian_explanation = self.uncertainty_service.explain_bayesian_reasoning()
+        return self._create_bayesian_explanation_response(bayesian_explanation, analysis_future.result())
+
+    def _handle_llm(self, user_message, patient_info, current_vitals, alerts_count):
+        """Full LLM path with the Bayesian-enhanced context"""
+        # Repeat question against unchanged vitals - reuse the stored
+        # response and skip both inference and the LLM round trip
+        cache_key = self._response_key(user_message, patient_info, current_vitals)
+        if cache_key is not None:
+            with self._response_cache_lock:
+                cached = self._response_cache.get(cache_key)
+                if cached is not None and time.monotonic() - cached[0] < _RESPONSE_CACHE_TTL:
+                    response = dict(cached[1])
+                    response['timestamp'] = _now_iso()
+                    return response
+
+        # Kick off the Bayesian analysis on the worker pool so it runs
+        # while the context prep executes
+        analysis_future = _EXECUTOR.submit(
+            self._cached_analysis, current_vitals, patient_info)
+
+        bayesian_analysis = analysis_future.result()
+
+        uncertainty_metrics = bayesian_analysis.get("uncertainty_metrics", {})
+        user_context = self._build_user_context(
+            user_message, patient_info, current_vitals, alerts_count, bayesian_analysis)
+
+        # Try to call OpenRouter API with enhanced Bayesian context
+        try:
+            # Split connect/read timeout: fail fast on unreachable hosts
+            # while still giving the model time to generate
+            api_response = self._post(
+                {
+                    'model': self.model,
+                    'messages': [
+                        self._system_message,
+                        {'role': 'user', 'content': user_context}
+                    ],
+                    'max_tokens': 600,
+                    'temperature': 0.7
+                },
+                timeout=(3.05, 30)
+            )
             
-            # Enhanced context with Bayesian insights
-            user_context = f"""
+            if api_response.status_code == 200:
+                response_data = _json_loads(api_response.content)
+                ai_response = response_data['choices'][0]['message']['content']
+
+                # Enhance response with Bayesian insights
+                enhanced_response = self._enhance_response_with_bayesian_data(ai_response, bayesian_analysis)
+                api_succeeded = True
+            else:
+                raise Exception(f"API Error: {api_response.status_code}")
+
+        except Exception as e:
+            logger.warning("AI API error: %s", e)
+            # Enhanced fallback response with Bayesian reasoning
+            enhanced_response = self._create_fallback_response_with_bayesian(user_message, bayesian_analysis, patient_info, current_vitals)
+            api_succeeded = False
+
+        result = {
+            'response': enhanced_response,
+            'timestamp': _now_iso(),
+            'bayesian_analysis': bayesian_analysis,
+            'confidence_level': uncertainty_metrics.get('overall_confidence', 'medium'),
+            'uncertainty_factors': uncertainty_metrics.get('uncertainty_sources', [])
+        }
+
+        # Only completed LLM answers are worth keeping; fallbacks stay
+        # uncached so the next turn retries the API
+        if api_succeeded and cache_key is not None:
+            with self._response_cache_lock:
+                if len(self._response_cache) >= _RESPONSE_CACHE_MAX:
+                    self._response_cache.pop(min(self._response_cache,
+                                                 key=lambda k: self._response_cache[k][0]))
+                self._response_cache[cache_key] = (time.monotonic(), result)
+
+        return result
+        
+    def _build_user_context(self, user_message, patient_info, current_vitals,
+                            alerts_count, bayesian_analysis):
+        """Build the Bayesian-enhanced user message sent to the model"""
+        uncertainty_metrics = bayesian_analysis.get("uncertainty_metrics", {})
+        risk_assessment = bayesian_analysis.get("risk_assessment", {})
+        recommendations = bayesian_analysis.get("recommendations", [])
+
+        return f"""
             Current Patient: {patient_info['name']}
-            Current Vitals: Heart Rate: {current_vitals['heart_rate']} BPM, SpO2: {current_vitals['spo2']}%, 
+            Current Vitals: Heart Rate: {current_vitals['heart_rate']} BPM, SpO2: {current_vitals['spo2']}%,
             Temperature: {current_vitals['temperature']}°C, Respiratory Rate: {current_vitals['respiratory_rate']} BPM
-            
+
             BAYESIAN NETWORK ANALYSIS:
             Confidence Level: {uncertainty_metrics.get('overall_confidence', 'unknown')}
             Risk Level: {risk_assessment.get('risk_level', 'unknown')}
             Primary Concern: {risk_assessment.get('primary_concern', {}).get('condition', 'None')}
-            
+
             Probabilistic Assessment:
             {self._format_probabilities_for_ai(bayesian_analysis.get('bayesian_inference', {}))}
-            
+
             Medical Recommendations:
             {self._format_recommendations_for_ai(recommendations)}
-            
+
             Recent Alerts: {alerts_count} total alerts
-            
+
             User Question: {user_message}
-            
+
             Please provide insights using probabilistic reasoning and explain uncertainty where relevant.
             """
-            
-            # Check if user is asking for Bayesian explanation
-            if any(keyword in user_message.lower() for keyword in ['bayesian', 'probability', 'uncertain', 'confidence', 'reasoning']):
-                # Provide detailed Bayesian explanation
-                bayesian_explanation = self.uncertainty_service.explain_bayesian_reasoning()
-                return self._create_bayesian_explanation_response(bayesian_explanation, bayesian_analysis)
-            
-            # Try to call OpenRouter API with enhanced Bayesian context
-            try:
-                api_response = requests.post(
-                    self.base_url,
-                    headers={
-                        'Authorization': f'Bearer {self.api_key}',
-                        'Content-Type': 'application/json',
-                        'HTTP-Referer': 'http://localhost:5000',
-                        'X-Title': 'Kognicare Patient Monitoring'
-                    },
-                    json={
-                        'model': self.model,
-                        'messages': [
-                            {'role': 'system', 'content': self.system_prompt},
-                            {'role': 'user', 'content': user_context}
-                        ],
-                        'max_tokens': 600,
-                        'temperature': 0.7
-                    },
-                    timeout=30
-                )
-                
-                if api_response.status_code == 200:
-                    response_data = api_response.json()
-                    ai_response = response_data['choices'][0]['message']['content']
-                    
-                    # Enhance response with Bayesian insights
-                    enhanced_response = self._enhance_response_with_bayesian_data(ai_response, bayesian_analysis)
-                else:
-                    raise Exception(f"API Error: {api_response.status_code}")
-                    
-            except Exception as e:
-                print(f"AI API Error: {e}")
-                # Enhanced fallback response with Bayesian reasoning
-                enhanced_response = self._create_fallback_response_with_bayesian(user_message, bayesian_analysis, patient_info, current_vitals)
 
-            return {
-                'response': enhanced_response,
-                'timestamp': datetime.now().isoformat(),
-                'bayesian_analysis': bayesian_analysis,
-                'confidence_level': uncertainty_metrics.get('overall_confidence', 'medium'),
-                'uncertainty_factors': uncertainty_metrics.get('uncertainty_sources', [])
-            }
-            
+    def chat_stream(self, user_message, patient_info, current_vitals, alerts_count):
+        """Stream the chat reply instead of blocking for the full completion
+
+        Yields {'delta': text} events as tokens arrive from OpenRouter's SSE
+        stream, then one final {'done': True, ...} event carrying the full
+        response and the Bayesian analysis, so callers see first tokens at
+        time-to-first-token rather than full-completion latency. The
+        blocking chat() path is unchanged.
+        """
+        analysis_future = _EXECUTOR.submit(
+            self._cached_analysis, current_vitals, patient_info)
+
+        # Explanation queries are answered locally - stream them as one chunk
+        if _BAYES_RE.search(user_message):
+            bayesian_analysis = analysis_future.result()
+            bayesian_explanation = self.uncertainty_service.explain_bayesian_reasoning()
+            response = self._create_bayesian_explanation_response(bayesian_explanation, bayesian_analysis)
+            yield {'delta': response}
+            yield {'done': True, 'response': response,
+                   'timestamp': _now_iso()}
+            return
+
+        bayesian_analysis = analysis_future.result()
+        uncertainty_metrics = bayesian_analysis.get('uncertainty_metrics', {})
+        user_context = self._build_user_context(
+            user_message, patient_info, current_vitals, alerts_count, bayesian_analysis)
+
+        collected = []
+        try:
+            api_response = self._post(
+                {
+                    'model': self.model,
+                    'messages': [
+                        self._system_message,
+                        {'role': 'user', 'content': user_context}
+                    ],
+                    'max_tokens': 600,
+                    'temperature': 0.7,
+                    'stream': True
+                },
+                timeout=(3.05, 60),
+                stream=True
+            )
+
+            if api_response.status_code != 200:
+                raise Exception(f"API Error: {api_response.status_code}")
+
+            for line in api_response.iter_lines():
+                if not line:
+                    continue
+                line = line.decode('utf-8')
+                if not line.startswith('data: '):
+                    continue
+                payload = line[len('data: '):]
+                if payload == '[DONE]':
+                    break
+                delta = _json_loads(payload).get('choices', [{}])[0].get('delta', {}).get('content')
+                if delta:
+                    collected.append(delta)
+                    yield {'delta': delta}
+
+            # Append the probabilistic summary trailer as a final chunk
+            streamed = "".join(collected)
+            response = self._enhance_response_with_bayesian_data(streamed, bayesian_analysis)
+            trailer = response[len(streamed):]
+            if trailer:
+                yield {'delta': trailer}
+
         except Exception as e:
-            return {
-                'error': 'Failed to process chat request',
-                'details': str(e),
-                'fallback_response': self._basic_fallback_response(user_message, current_vitals, patient_info)
-            }
-    
+            logger.warning("AI API error: %s", e)
+            response = self._create_fallback_response_with_bayesian(
+                user_message, bayesian_analysis, patient_info, current_vitals)
+            yield {'delta': response}
+
+        yield {
+            'done': True,
+            'response': response,
+            'timestamp': _now_iso(),
+            'bayesian_analysis': bayesian_analysis,
+            'confidence_level': uncertainty_metrics.get('overall_confidence', 'medium'),
+            'uncertainty_factors': uncertainty_metrics.get('uncertainty_sources', [])
+        }
+
+    def chat_batch(self, requests_list):
+        """Answer several chat queries with a single OpenRouter call
+
+        Dashboards refreshing insights for many patients would otherwise fan
+        out to N sequential LLM requests, each repeating the system prompt.
+        The queries are tagged with ids, packed into one structured user
+        message, and the model is asked to return one JSON answer per id.
+        The Bayesian analyses for the batch run in parallel on the worker
+        pool before the call.
+        """
+        analyses = list(_EXECUTOR.map(
+            lambda req: self._cached_analysis(req.get('vitals', {}), req.get('patient_info')),
+            requests_list
+        ))
+
+        queries = []
+        for i, (req, analysis) in enumerate(zip(requests_list, analyses)):
+            uncertainty_metrics = analysis.get('uncertainty_metrics', {})
+            risk_assessment = analysis.get('risk_assessment', {})
+            queries.append({
+                'id': req.get('id', i),
+                'patient': (req.get('patient_info') or {}).get('name', 'Unknown'),
+                'vitals': req.get('vitals', {}),
+                'confidence': uncertainty_metrics.get('overall_confidence', 'unknown'),
+                'risk_level': risk_assessment.get('risk_level', 'unknown'),
+                'question': req.get('message', '')
+            })
+
+        batch_context = f"""You are given several patient monitoring queries as JSON.
+            Each query includes the patient's vitals and a Bayesian risk summary.
+            Answer every query using probabilistic reasoning, and respond ONLY with JSON
+            of the form {{"answers": [{{"id": <query id>, "response": <answer text>}}]}}.
+
+            {json.dumps({'queries': queries})}"""
+
+        answers = {}
+        try:
+            api_response = self._post(
+                {
+                    'model': self.model,
+                    'messages': [
+                        self._system_message,
+                        {'role': 'user', 'content': batch_context}
+                    ],
+                    'max_tokens': 300 * max(len(queries), 1),
+                    'temperature': 0.7,
+                    'stream': False
+                },
+                timeout=(3.05, 60)
+            )
+
+            if api_response.status_code == 200:
+                response_data = _json_loads(api_response.content)
+                content = response_data['choices'][0]['message']['content']
+                # Tolerate markdown fences around the returned JSON
+                content = content.strip().strip('`').lstrip('json').strip()
+                for answer in _json_loads(content).get('answers', []):
+                    answers[answer.get('id')] = answer.get('response', '')
+            else:
+                raise Exception(f"API Error: {api_response.status_code}")
+
+        except Exception as e:
+            logger.warning("AI API error: %s", e)
+
+        # Any query the model failed to answer falls back to the local
+        # Bayesian summary, same as single-turn chat
+        timestamp = _now_iso()
+        results = []
+        for query, req, analysis in zip(queries, requests_list, analyses):
+            response_text = answers.get(query['id'])
+            if not response_text:
+                response_text = self._create_fallback_response_with_bayesian(
+                    query['question'], analysis,
+                    req.get('patient_info') or {'attending_doctor': 'your physician'},
+                    req.get('vitals', {}))
+            results.append({
+                'id': query['id'],
+                'response': response_text,
+                'timestamp': timestamp,
+                'confidence_level': query['confidence']
+            })
+
+        return results
+
     def _format_probabilities_for_ai(self, bayesian_inference: dict) -> str:
         """Format Bayesian probabilities for AI context"""
         formatted = []
-        
+
         for condition, probabilities in bayesian_inference.items():
-            if condition in ['heart_failure', 'sepsis', 'respiratory_distress', 'patient_status']:
-                if isinstance(probabilities, dict):
-                    max_state = max(probabilities.items(), key=lambda x: x[1])
-                    formatted.append(f"{condition.replace('_', ' ').title()}: {max_state[0]} ({max_state[1]*100:.1f}%)")
-        
+            if condition in _TRACKED and isinstance(probabilities, dict) and probabilities:
+                # argmax over a contiguous array instead of max(key=lambda)
+                states = list(probabilities)
+                probs = np.fromiter(probabilities.values(), dtype=np.float64,
+                                    count=len(states))
+                i = probs.argmax()
+                formatted.append(f"{condition.replace('_', ' ').title()}: {states[i]} ({probs[i]*100:.1f}%)")
+
         return "\n".join(formatted)
     
     def _format_recommendations_for_ai(self, recommendations: list) -> str:
@@ -137,56 +516,55 @@ class AIAssistant:
     
     def _create_bayesian_explanation_response(self, explanation: dict, analysis: dict) -> str:
         """Create detailed Bayesian reasoning explanation"""
-        response = f"""🧠 **BAYESIAN NETWORK ANALYSIS**
+        # Collect fragments and join once instead of quadratic += appends
+        parts = [f"""🧠 **BAYESIAN NETWORK ANALYSIS**
 
 **Methodology**: Probabilistic reasoning using Bayesian Networks to manage uncertainty in medical diagnosis.
 
 **Current Evidence**: {', '.join([f'{k}={v}' for k, v in explanation.get('evidence', {}).items()])}
 
 **Probability Distribution**:
-"""
-        
+"""]
+
         # Add probability details
         probabilities = explanation.get('probabilities', {})
         for state, prob in sorted(probabilities.items(), key=lambda x: x[1], reverse=True):
             confidence_bar = "█" * int(prob * 10) + "░" * (10 - int(prob * 10))
-            response += f"• **{state.title()}**: {prob:.3f} ({prob*100:.1f}%) {confidence_bar}\n"
-        
-        response += f"""
+            parts.append(f"• **{state.title()}**: {prob:.3f} ({prob*100:.1f}%) {confidence_bar}\n")
+
+        parts.append(f"""
 **Confidence Level**: {analysis.get('uncertainty_metrics', {}).get('overall_confidence', 'medium').title()}
 
 **Medical Reasoning**:
 {explanation.get('reasoning', 'Analysis based on current vital signs and medical knowledge base.')}
 
 **Key Uncertainty Factors**:
-"""
-        
+""")
+
         uncertainty_sources = analysis.get('uncertainty_metrics', {}).get('uncertainty_sources', [])
         for source in uncertainty_sources:
-            response += f"• {source}\n"
-        
-        response += f"""
+            parts.append(f"• {source}\n")
+
+        parts.append("""
 **Clinical Interpretation**: This probabilistic analysis helps quantify diagnostic uncertainty and supports evidence-based medical decision making.
 
-⚠️ **Note**: This analysis should be interpreted by qualified medical professionals alongside clinical judgment."""
-        
-        return response
+⚠️ **Note**: This analysis should be interpreted by qualified medical professionals alongside clinical judgment.""")
+
+        return "".join(parts)
     
     def _enhance_response_with_bayesian_data(self, ai_response: str, bayesian_analysis: dict) -> str:
         """Enhance AI response with Bayesian insights"""
         confidence = bayesian_analysis.get('uncertainty_metrics', {}).get('overall_confidence', 'medium')
         risk_level = bayesian_analysis.get('risk_assessment', {}).get('risk_level', 'unknown')
         
-        enhanced = ai_response + f"""
+        return "".join([ai_response, f"""
 
 📊 **PROBABILISTIC ANALYSIS SUMMARY**:
 • **Confidence**: {confidence.title()}
 • **Risk Assessment**: {risk_level.title()}
 • **Uncertainty Management**: Bayesian inference accounts for measurement uncertainty and incomplete data
 
-💡 This analysis uses advanced probabilistic reasoning to provide confidence estimates with medical recommendations."""
-        
-        return enhanced
+💡 This analysis uses advanced probabilistic reasoning to provide confidence estimates with medical recommendations."""])
     
     def _create_fallback_response_with_bayesian(self, user_message: str, bayesian_analysis: dict, patient_info: dict, current_vitals: dict) -> str:
         """Create fallback response enhanced with Bayesian analysis"""
@@ -195,7 +573,7 @@ class AIAssistant:
         risk_assessment = bayesian_analysis.get('risk_assessment', {})
         recommendations = bayesian_analysis.get('recommendations', [])
         
-        response = f"""🤖 **BAYESIAN-ENHANCED MEDICAL ANALYSIS**
+        parts = [f"""🤖 **BAYESIAN-ENHANCED MEDICAL ANALYSIS**
 
 I'm currently using advanced Bayesian reasoning to analyze "{user_message}":
 
@@ -205,34 +583,34 @@ I'm currently using advanced Bayesian reasoning to analyze "{user_message}":
 • **Risk Assessment**: {risk_assessment.get('risk_level', 'unknown').title()}
 
 **Probabilistic Diagnosis**:
-"""
-        
+"""]
+
         # Add primary concern if available
         primary_concern = risk_assessment.get('primary_concern', {})
         if primary_concern.get('condition', '') != 'No significant concerns':
-            response += f"• **Primary Concern**: {primary_concern.get('condition', 'N/A')} ({primary_concern.get('probability', 0)*100:.1f}% probability)\n"
+            parts.append(f"• **Primary Concern**: {primary_concern.get('condition', 'N/A')} ({primary_concern.get('probability', 0)*100:.1f}% probability)\n")
         else:
-            response += "• **Assessment**: No significant medical concerns detected\n"
-        
+            parts.append("• **Assessment**: No significant medical concerns detected\n")
+
         # Add top recommendation
         if recommendations:
             top_rec = recommendations[0]
-            response += f"• **Primary Recommendation**: {top_rec.get('recommendation', 'Continue monitoring')}\n"
-        
-        response += f"""
+            parts.append(f"• **Primary Recommendation**: {top_rec.get('recommendation', 'Continue monitoring')}\n")
+
+        parts.append("""
 **Uncertainty Factors**:
-"""
-        
+""")
+
         uncertainty_sources = uncertainty_metrics.get('uncertainty_sources', ['Standard measurement uncertainty'])
         for source in uncertainty_sources[:2]:  # Top 2 factors
-            response += f"• {source}\n"
-        
-        response += f"""
+            parts.append(f"• {source}\n")
+
+        parts.append(f"""
 🏥 **Clinical Guidance**: Please consult with {patient_info['attending_doctor']} for any specific medical concerns.
 
-📈 This analysis demonstrates probabilistic reasoning under uncertainty - a key advantage of Bayesian Networks in medical AI."""
-        
-        return response
+📈 This analysis demonstrates probabilistic reasoning under uncertainty - a key advantage of Bayesian Networks in medical AI.""")
+
+        return "".join(parts)
     
     def _basic_fallback_response(self, user_message: str, current_vitals: dict, patient_info: dict) -> str:
         """Basic fallback when all other methods fail"""
@@ -243,40 +621,86 @@ Current vital signs: HR {current_vitals['heart_rate']}, SpO2 {current_vitals['sp
 For your question about "{user_message}", please consult directly with {patient_info['attending_doctor']} for medical guidance.
 
 The system will attempt to restore full Bayesian analysis capabilities shortly."""
-        """Check OpenRouter API availability"""
+
+    def check_api_status(self):
+        """Check OpenRouter API availability (cached for 5 minutes)"""
+        cached = self._status_cache
+        if cached['value'] is not None and time.monotonic() - cached['ts'] < _STATUS_TTL:
+            return cached['value']
+        return self._probe_api_status()
+
+    def _probe_api_status(self):
+        """Hit the API and refresh the cached status"""
         try:
-            api_status = requests.get(
-                'https://openrouter.ai/api/v1/models', 
-                headers={'Authorization': f'Bearer {self.api_key}'},
-                timeout=5
+            api_status = self.session.get(
+                'https://openrouter.ai/api/v1/models',
+                timeout=(3.05, 5)
             )
             api_available = api_status.status_code == 200
-            
+
             if api_available:
                 models_data = api_status.json()
-                phi_available = any('phi-3.5-mini-128k-instruct' in model.get('id', '') for model in models_data.get('data', []))
+                phi_available = any(model.get('id', '').startswith('microsoft/phi-3.5-mini-128k-instruct')
+                                    for model in models_data.get('data', ()))
             else:
                 phi_available = False
-                
+
         except Exception:
             api_available = False
             phi_available = False
-        
-        return {
+
+        status = {
             'api_available': api_available,
             'phi3_available': phi_available,
             'provider': 'OpenRouter (Phi-3.5 Mini 128K Instruct)'
         }
-    
+        self._status_cache = {'ts': time.monotonic(), 'value': status}
+        return status
+
+    def _status_refresh_loop(self):
+        """Keep the API status cache warm so callers never probe inline"""
+        while True:
+            time.sleep(_STATUS_TTL)
+            try:
+                self._probe_api_status()
+            except Exception:
+                pass
+
+    def _warmup(self):
+        """Pay cold-start costs off the request path
+
+        Resolves DNS and opens a TLS session to the API host, then runs one
+        throwaway inference so the Bayesian network (and any Numba kernel
+        compilation) is built before the first user request. Each step is
+        best-effort: a failure here only means the first real request pays
+        the cost instead.
+        """
+        try:
+            self.session.head(self.base_url, timeout=(3.05, 5))
+        except Exception:
+            pass
+        try:
+            # update_with_vitals builds the shared network without touching
+            # the service's diagnosis history
+            self.uncertainty_service.bayesian_network.update_with_vitals(
+                {'heart_rate': 75, 'spo2': 97, 'temperature': 36.8, 'respiratory_rate': 16})
+        except Exception:
+            pass
+
     def get_bayesian_insights(self, current_vitals: dict) -> dict:
         """Get direct Bayesian insights for medical analysis"""
         try:
-            analysis = self.uncertainty_service.analyze_patient_state(current_vitals)
+            # The three reads are independent - fan them out on the worker
+            # pool so latency is the slowest of the three, not their sum
+            analysis_future = _EXECUTOR.submit(self._cached_analysis, current_vitals)
+            explanation_future = _EXECUTOR.submit(self.uncertainty_service.explain_bayesian_reasoning)
+            structure_future = _EXECUTOR.submit(self._cached_network_structure)
+
             return {
                 'success': True,
-                'analysis': analysis,
-                'explanation': self.uncertainty_service.explain_bayesian_reasoning(),
-                'network_structure': self.uncertainty_service.get_network_structure()
+                'analysis': analysis_future.result(),
+                'explanation': explanation_future.result(),
+                'network_structure': structure_future.result()
             }
         except Exception as e:
             return {
@@ -287,3 +711,10 @@ The system will attempt to restore full Bayesian analysis capabilities shortly."
 
 # Global instance
 ai_assistant = AIAssistant()
+
+# Warm DNS/TLS and the Bayesian network in the background so the first real
+# chat doesn't absorb the cold-start latency
+threading.Thread(target=ai_assistant._warmup, daemon=True).start()
+
+# Periodic API-status probe keeps check_api_status() answering from cache
+threading.Thread(target=ai_assistant._status_refresh_loop, daemon=True).start()
@@ -2,25 +2,129 @@
 Uncertainty Service for KogniCare
 Integrates Bayesian Networks with real-time patient monitoring for probabilistic reasoning
 """
+from collections import deque
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+from functools import lru_cache
+from math import sqrt
 import json
-from src.models.bayesian_network import medical_bayesian_network
+import numpy as np
+from src.models.bayesian_network import VitalState, get_medical_bayesian_network
+
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+def _mod_entropy(p):
+    """Modified medical entropy -sum(p * sqrt(p)) over a probability array
+
+    Written as an explicit scalar loop so Numba can compile it when
+    available; probabilities <= 0 contribute nothing.
+    """
+    total = 0.0
+    for i in range(p.size):
+        if p[i] > 0.0:
+            total -= p[i] * sqrt(p[i])
+    return total
+
+try:
+    from numba import njit
+    _mod_entropy = njit(cache=True)(_mod_entropy)
+except ImportError:
+    # Without Numba the scalar loop loses to NumPy's reduction, so fall
+    # back to the vectorized form
+    def _mod_entropy(p):
+        pos = p[p > 0]
+        return float(-(pos * np.sqrt(pos)).sum())
+
+# Conditions tracked by the network, with their display forms precomputed
+_CONDITIONS = ("heart_failure", "sepsis", "respiratory_distress")
+_CONDITION_TEXT = {c: c.replace("_", " ") for c in _CONDITIONS}
+_CONDITION_LABELS = {c: _CONDITION_TEXT[c].title() for c in _CONDITIONS}
+
+# Normal range and display unit per monitored vital sign
+_VITAL_RANGES = {
+    "heart_rate": (60, 100, "BPM"),
+    "spo2": (95, 100, "%"),
+    "temperature": (36.0, 37.5, "°C"),
+    "respiratory_rate": (12, 20, "BPM")
+}
+
+@lru_cache(maxsize=4096)
+def _classify_vital(vital_name: str, value: float) -> str:
+    """Memoized display-name classification for a (vital, rounded value) pair
+
+    Vitals on a monitored patient change slowly, so the same rounded
+    readings recur constantly; the cache turns repeat classifications
+    into a dict lookup.
+    """
+    network = get_medical_bayesian_network()
+    return network.nodes[vital_name].state_name(
+        network.classify_vital_value(vital_name, value))
+
+# Static blocks of the reasoning explanation - the methodology and academic
+# framing never change per call, only the evidence-driven parts do
+_MEDICAL_CONTEXT = {
+    "methodology": "Probabilistic reasoning using Bayesian Networks",
+    "uncertainty_management": "Accounts for sensor noise, measurement errors, and incomplete information",
+    "evidence_integration": "Combines multiple vital signs to assess medical conditions",
+    "dynamic_updates": "Probabilities update as new evidence becomes available"
+}
+
+_ACADEMIC_SIGNIFICANCE = {
+    "ai_technique": "Bayesian Networks for uncertainty reasoning",
+    "domain_application": "Medical diagnosis and patient monitoring",
+    "key_advantages": [
+        "Handles uncertainty and incomplete data",
+        "Provides probabilistic confidence measures",
+        "Enables reasoning under uncertainty",
+        "Supports evidence-based decision making"
+    ]
+}
 
 class UncertaintyAnalysisService:
     """Service for managing uncertainty in medical diagnosis using Bayesian Networks"""
-    
+
     def __init__(self):
-        self.bayesian_network = medical_bayesian_network
-        self.diagnosis_history = []
+        self._bayesian_network = None
+        self._network_structure = None
+        # Ring buffer: appends evict the oldest entry in O(1) instead of
+        # shifting a list
+        self.diagnosis_history = deque(maxlen=50)
         self.confidence_threshold = 0.7
+        # Embedded deployments that only read primary_concern can disable
+        # the full per-condition probability breakdown in risk assessments
+        self.include_full_concerns = True
         self.uncertainty_factors = {
             "sensor_noise": 0.05,
             "measurement_error": 0.03,
             "patient_movement": 0.02,
             "equipment_calibration": 0.01
         }
-    
+        # The factors are static between update_uncertainty_factors calls,
+        # so the measurement-uncertainty check is evaluated once here
+        self._has_measurement_uncertainty = any(
+            factor > 0.03 for factor in self.uncertainty_factors.values())
+
+    @property
+    def bayesian_network(self):
+        """Shared medical network, resolved lazily on first analysis"""
+        if self._bayesian_network is None:
+            self._bayesian_network = get_medical_bayesian_network()
+        return self._bayesian_network
+
+    def update_uncertainty_factors(self, factors: Dict[str, float]):
+        """Replace the uncertainty factors and refresh the cached check"""
+        self.uncertainty_factors = dict(factors)
+        self._has_measurement_uncertainty = any(
+            factor > 0.03 for factor in self.uncertainty_factors.values())
+
+
     def analyze_patient_state(self, vitals: Dict[str, float], patient_info: Dict = None) -> Dict[str, Any]:
         """
         Perform comprehensive uncertainty analysis using Bayesian inference
@@ -33,34 +137,47 @@ class UncertaintyAnalysisService:
             Comprehensive analysis including probabilities, uncertainty measures, and recommendations
         """
         try:
+            # One timestamp per tick - the history entry and the returned
+            # analysis share it
+            ts = datetime.now().isoformat()
+
             # Update Bayesian network with current vitals
             bayesian_results = self.bayesian_network.update_with_vitals(vitals)
-            
+
+            # Traverse the inference results once; the metric, risk and
+            # recommendation passes all read from the shared scan
+            scan = self._scan_bayesian(bayesian_results)
+
             # Calculate uncertainty metrics
-            uncertainty_metrics = self._calculate_uncertainty_metrics(bayesian_results)
-            
+            uncertainty_metrics = self._calculate_uncertainty_metrics(bayesian_results, scan)
+
             # Generate risk assessment
-            risk_assessment = self._assess_medical_risk(bayesian_results, vitals)
-            
+            risk_assessment = self._assess_medical_risk(scan, vitals)
+
             # Create diagnostic recommendations
-            recommendations = self._generate_recommendations(bayesian_results, uncertainty_metrics)
+            recommendations = self._generate_recommendations(scan, uncertainty_metrics)
             
-            # Track diagnosis over time
+            # Track diagnosis over time; the integer risk level is frozen
+            # here so trend analysis compares stored ints instead of
+            # re-deriving levels from nested probability dicts
+            status_probs = scan["patient_status"]
+            risk_level_int = (3 if status_probs.get("critical", 0) > 0.4
+                              else 2 if status_probs.get("at_risk", 0) > 0.4 else 1)
             diagnosis_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "vitals": vitals.copy(),
+                "timestamp": ts,
+                # Compact tuple instead of a dict copy - history is only
+                # read back for probabilities and confidence
+                "vitals": (vitals.get("heart_rate"), vitals.get("spo2"),
+                           vitals.get("temperature"), vitals.get("respiratory_rate")),
                 "probabilities": bayesian_results,
                 "confidence": uncertainty_metrics["overall_confidence"],
-                "primary_diagnosis": risk_assessment["primary_concern"]
+                "primary_diagnosis": risk_assessment["primary_concern"],
+                "risk_level_int": risk_level_int
             }
             self.diagnosis_history.append(diagnosis_entry)
-            
-            # Keep only last 50 entries
-            if len(self.diagnosis_history) > 50:
-                self.diagnosis_history.pop(0)
-            
+
             return {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": ts,
                 "vitals_input": vitals,
                 "bayesian_inference": bayesian_results,
                 "uncertainty_metrics": uncertainty_metrics,
@@ -77,21 +194,107 @@ class UncertaintyAnalysisService:
                 "fallback_assessment": self._fallback_assessment(vitals)
             }
     
-    def _calculate_uncertainty_metrics(self, bayesian_results: Dict) -> Dict[str, Any]:
+    def analyze_patient_state_json(self, vitals: Dict[str, float], patient_info: Dict = None) -> bytes:
+        """Analysis serialized straight to JSON bytes
+
+        Transport and logging consumers can skip a second json.dumps pass;
+        with orjson installed the encoding runs in C.
+        """
+        return _json_dumps(self.analyze_patient_state(vitals, patient_info))
+
+    def analyze_patient_states(self, vitals_batch: List[Dict[str, float]]) -> List[Dict[str, Any]]:
+        """Analyze a batch of vitals samples in one pass
+
+        Returns one analysis per sample with the same schema as
+        analyze_patient_state. Vitals discretize to three states per sign,
+        so large batches collapse to a handful of distinct evidence
+        configurations - inference and the result scan run once per
+        configuration and are shared across matching samples. Batch
+        analysis is read-only: it does not append to diagnosis_history.
+        """
+        ts = datetime.now().isoformat()
+        network = self.bayesian_network
+        trend_analysis = self._analyze_trends()
+        memo = {}
+        results = []
+
+        for vitals in vitals_batch:
+            try:
+                key = tuple(sorted(
+                    (name, network.classify_vital_value(name, value))
+                    for name, value in vitals.items() if name in _VITAL_RANGES))
+                shared = memo.get(key)
+                if shared is None:
+                    bayesian_results = network.update_with_vitals(vitals)
+                    shared = memo[key] = (bayesian_results, self._scan_bayesian(bayesian_results))
+                bayesian_results, scan = shared
+
+                uncertainty_metrics = self._calculate_uncertainty_metrics(bayesian_results, scan)
+                risk_assessment = self._assess_medical_risk(scan, vitals)
+                recommendations = self._generate_recommendations(scan, uncertainty_metrics)
+
+                results.append({
+                    "timestamp": ts,
+                    "vitals_input": vitals,
+                    "bayesian_inference": bayesian_results,
+                    "uncertainty_metrics": uncertainty_metrics,
+                    "risk_assessment": risk_assessment,
+                    "recommendations": recommendations,
+                    "confidence_level": uncertainty_metrics["overall_confidence"],
+                    "trend_analysis": trend_analysis
+                })
+            except Exception as e:
+                results.append({
+                    "error": f"Failed to perform uncertainty analysis: {str(e)}",
+                    "timestamp": ts,
+                    "fallback_assessment": self._fallback_assessment(vitals)
+                })
+
+        return results
+
+    def _scan_bayesian(self, bayesian_results: Dict) -> Dict[str, Any]:
+        """Summarize the inference results in a single traversal
+
+        Returns per-condition severe/mild probabilities together with the
+        modified entropy (-sum(p * sqrt(p))) and max probability of each
+        distribution, plus the patient_status figures. Downstream passes
+        read this struct instead of re-walking bayesian_results.
+        """
+        conditions = {}
+        for condition in _CONDITIONS:
+            probs = bayesian_results.get(condition, {})
+            if probs:
+                p = np.fromiter(probs.values(), dtype=np.float64)
+                entropy, max_prob = float(_mod_entropy(p)), float(p.max())
+            else:
+                entropy, max_prob = 0.0, 0.0
+            conditions[condition] = {
+                "present": condition in bayesian_results,
+                "severe": probs.get("severe", 0.0),
+                "mild": probs.get("mild", 0.0),
+                "max": max_prob,
+                "entropy": entropy
+            }
+
+        patient_status = bayesian_results.get("patient_status", {})
+        if patient_status:
+            p = np.fromiter(patient_status.values(), dtype=np.float64)
+            status_entropy, status_max = float(_mod_entropy(p)), float(p.max())
+        else:
+            status_entropy, status_max = 0.0, 0.0
+
+        return {
+            "conditions": conditions,
+            "patient_status": patient_status,
+            "patient_status_max": status_max,
+            "patient_status_entropy": status_entropy
+        }
+
+    def _calculate_uncertainty_metrics(self, bayesian_results: Dict, scan: Dict) -> Dict[str, Any]:
         """Calculate various uncertainty metrics from Bayesian inference results"""
-        
-        # Calculate entropy for each diagnosis
-        def calculate_entropy(probabilities: Dict[str, float]) -> float:
-            """Calculate Shannon entropy to measure uncertainty"""
-            entropy = 0.0
-            for prob in probabilities.values():
-                if prob > 0:
-                    entropy -= prob * (prob ** 0.5)  # Modified entropy for medical context
-            return entropy
-        
+
         # Calculate confidence metrics
-        patient_status_probs = bayesian_results.get("patient_status", {})
-        max_status_prob = max(patient_status_probs.values()) if patient_status_probs else 0.0
+        max_status_prob = scan["patient_status_max"]
         
         # Overall confidence based on maximum probability
         if max_status_prob >= 0.8:
@@ -106,12 +309,12 @@ class UncertaintyAnalysisService:
         
         # Calculate uncertainty for each condition
         condition_uncertainties = {}
-        for condition in ["heart_failure", "sepsis", "respiratory_distress"]:
-            if condition in bayesian_results:
-                entropy = calculate_entropy(bayesian_results[condition])
+        for condition, info in scan["conditions"].items():
+            if info["present"]:
+                entropy = info["entropy"]
                 condition_uncertainties[condition] = {
                     "entropy": entropy,
-                    "max_probability": max(bayesian_results[condition].values()),
+                    "max_probability": info["max"],
                     "confidence": "high" if entropy < 0.5 else "medium" if entropy < 0.8 else "low"
                 }
         
@@ -119,35 +322,40 @@ class UncertaintyAnalysisService:
         uncertainty_sources = []
         
         # Check for conflicting evidence
+        # The public payload keeps display-name states, so map back to the
+        # integer enum for the abnormality count
         vitals_classification = bayesian_results.get("vitals_classification", {})
-        abnormal_vitals = sum(1 for state in vitals_classification.values() if state != "normal")
+        states = np.fromiter(
+            (VitalState[state.upper()] for state in vitals_classification.values()),
+            dtype=np.int8, count=len(vitals_classification))
+        abnormal_vitals = int((states != VitalState.NORMAL).sum())
         
         if abnormal_vitals >= 3:
             uncertainty_sources.append("Multiple abnormal vital signs create diagnostic complexity")
         elif abnormal_vitals == 0:
             uncertainty_sources.append("All vital signs normal - low probability of serious conditions")
         
-        # Check for measurement uncertainty
-        if any(factor > 0.03 for factor in self.uncertainty_factors.values()):
+        # Check for measurement uncertainty (precomputed in __init__)
+        if self._has_measurement_uncertainty:
             uncertainty_sources.append("Potential sensor measurement uncertainty")
-        
+
+        entropy_analysis = {condition: info["entropy"] for condition, info in scan["conditions"].items()}
+        entropy_analysis["patient_status"] = scan["patient_status_entropy"]
+
         return {
             "overall_confidence": confidence_level,
             "confidence_score": confidence_score,
             "max_probability": max_status_prob,
             "condition_uncertainties": condition_uncertainties,
             "uncertainty_sources": uncertainty_sources,
-            "entropy_analysis": {
-                condition: calculate_entropy(bayesian_results.get(condition, {}))
-                for condition in ["heart_failure", "sepsis", "respiratory_distress", "patient_status"]
-            }
+            "entropy_analysis": entropy_analysis
         }
     
-    def _assess_medical_risk(self, bayesian_results: Dict, vitals: Dict) -> Dict[str, Any]:
+    def _assess_medical_risk(self, scan: Dict, vitals: Dict) -> Dict[str, Any]:
         """Assess medical risk based on Bayesian inference and vital signs"""
-        
-        patient_status = bayesian_results.get("patient_status", {})
-        
+
+        patient_status = scan["patient_status"]
+
         # Determine primary risk level
         critical_prob = patient_status.get("critical", 0.0)
         at_risk_prob = patient_status.get("at_risk", 0.0)
@@ -165,37 +373,43 @@ class UncertaintyAnalysisService:
         
         # Identify primary medical concerns
         concerns = []
-        concern_probabilities = {}
-        
-        for condition in ["heart_failure", "sepsis", "respiratory_distress"]:
-            condition_probs = bayesian_results.get(condition, {})
-            severe_prob = condition_probs.get("severe", 0.0)
-            mild_prob = condition_probs.get("mild", 0.0)
-            
-            concern_probabilities[condition] = {
-                "severe": severe_prob,
-                "mild": mild_prob,
-                "total_risk": severe_prob + mild_prob
-            }
-            
+        concern_probabilities = {} if self.include_full_concerns else None
+
+        for condition, info in scan["conditions"].items():
+            severe_prob = info["severe"]
+            mild_prob = info["mild"]
+
+            if self.include_full_concerns:
+                concern_probabilities[condition] = {
+                    "severe": severe_prob,
+                    "mild": mild_prob,
+                    "total_risk": severe_prob + mild_prob
+                }
+
             if severe_prob > 0.3:
                 concerns.append({
-                    "condition": condition.replace("_", " ").title(),
+                    "condition": _CONDITION_LABELS[condition],
                     "severity": "severe",
                     "probability": severe_prob,
                     "confidence": "high" if severe_prob > 0.6 else "moderate"
                 })
             elif mild_prob + severe_prob > 0.4:
                 concerns.append({
-                    "condition": condition.replace("_", " ").title(),
+                    "condition": _CONDITION_LABELS[condition],
                     "severity": "mild",
                     "probability": mild_prob + severe_prob,
                     "confidence": "moderate"
                 })
         
-        # Determine primary concern
+        # Determine primary concern with a direct scan - no key-lambda
+        # construction per tick for a list of at most three entries
         if concerns:
-            primary_concern = max(concerns, key=lambda x: x["probability"])
+            primary_concern = concerns[0]
+            best_prob = primary_concern["probability"]
+            for concern in concerns[1:]:
+                prob = concern["probability"]
+                if prob > best_prob:
+                    primary_concern, best_prob = concern, prob
         else:
             primary_concern = {
                 "condition": "No significant concerns",
@@ -219,85 +433,93 @@ class UncertaintyAnalysisService:
         assessment = {}
         
         for vital_name, value in vitals.items():
-            if vital_name in ["heart_rate", "spo2", "temperature", "respiratory_rate"]:
-                
-                # Get classification from Bayesian network
-                classification = self.bayesian_network.classify_vital_value(vital_name, value)
-                
-                # Calculate deviation from normal range
-                if vital_name == "heart_rate":
-                    normal_range = (60, 100)
-                    unit = "BPM"
-                elif vital_name == "spo2":
-                    normal_range = (95, 100)
-                    unit = "%"
-                elif vital_name == "temperature":
-                    normal_range = (36.0, 37.5)
-                    unit = "°C"
-                elif vital_name == "respiratory_rate":
-                    normal_range = (12, 20)
-                    unit = "BPM"
-                
-                # Calculate how far from normal range
-                if value < normal_range[0]:
-                    deviation = normal_range[0] - value
-                    direction = "below"
-                elif value > normal_range[1]:
-                    deviation = value - normal_range[1]
-                    direction = "above"
-                else:
-                    deviation = 0
-                    direction = "within"
-                
-                assessment[vital_name] = {
-                    "value": value,
-                    "unit": unit,
-                    "classification": classification,
-                    "normal_range": normal_range,
-                    "deviation": deviation,
-                    "direction": direction,
-                    "concern_level": "high" if classification == "high" or classification == "low" else "normal"
-                }
+            ranges = _VITAL_RANGES.get(vital_name)
+            if ranges is None:
+                continue
+            low, high, unit = ranges
+
+            # Classification comes from the Bayesian network via the
+            # memoized module-level wrapper
+            classification = _classify_vital(vital_name, round(value, 1))
+
+            # Calculate how far from normal range
+            if value < low:
+                deviation = low - value
+                direction = "below"
+            elif value > high:
+                deviation = value - high
+                direction = "above"
+            else:
+                deviation = 0
+                direction = "within"
+
+            assessment[vital_name] = {
+                "value": value,
+                "unit": unit,
+                "classification": classification,
+                "normal_range": (low, high),
+                "deviation": deviation,
+                "direction": direction,
+                "concern_level": "high" if classification == "high" or classification == "low" else "normal"
+            }
         
         return assessment
     
-    def _generate_recommendations(self, bayesian_results: Dict, uncertainty_metrics: Dict) -> List[Dict[str, Any]]:
+    def _generate_recommendations(self, scan: Dict, uncertainty_metrics: Dict) -> List[Dict[str, Any]]:
         """Generate medical recommendations based on Bayesian analysis"""
-        
+
         recommendations = []
-        
-        patient_status = bayesian_results.get("patient_status", {})
+
+        patient_status = scan["patient_status"]
         confidence = uncertainty_metrics["confidence_score"]
-        
+
+        # Fast path for the common case: a clearly stable patient with no
+        # severe condition signal and too little history for trends. The
+        # full walk below could only produce the routine recommendation
+        # (stable >= 0.8 caps critical/at_risk below their thresholds and
+        # forces the high-confidence score), so return it directly.
+        if (patient_status.get("stable", 0.0) >= 0.8
+                and len(self.diagnosis_history) < 3
+                and all(info["severe"] <= 0.3 for info in scan["conditions"].values())):
+            return [{
+                "priority": "routine",
+                "type": "monitoring",
+                "recommendation": "Continue routine monitoring",
+                "reasoning": "Current vital signs and Bayesian analysis suggest stable condition",
+                "confidence": confidence
+            }]
+
         # Critical status recommendations
-        if patient_status.get("critical", 0) > 0.3:
+        critical_prob = patient_status.get("critical", 0)
+        at_risk_prob = patient_status.get("at_risk", 0)
+        if critical_prob > 0.3:
             recommendations.append({
                 "priority": "immediate",
                 "type": "intervention",
                 "recommendation": "Immediate medical evaluation required",
-                "reasoning": f"High probability ({patient_status.get('critical', 0)*100:.1f}%) of critical condition",
+                "reasoning": f"High probability ({critical_prob*100:.1f}%) of critical condition",
                 "confidence": confidence
             })
-        
+
         # At-risk recommendations
-        elif patient_status.get("at_risk", 0) > 0.4:
+        elif at_risk_prob > 0.4:
             recommendations.append({
                 "priority": "urgent",
                 "type": "monitoring",
                 "recommendation": "Enhanced monitoring and medical consultation",
-                "reasoning": f"Elevated risk detected ({patient_status.get('at_risk', 0)*100:.1f}% probability)",
+                "reasoning": f"Elevated risk detected ({at_risk_prob*100:.1f}% probability)",
                 "confidence": confidence
             })
-        
+
         # Specific condition recommendations
-        for condition in ["heart_failure", "sepsis", "respiratory_distress"]:
-            condition_probs = bayesian_results.get(condition, {})
-            if condition_probs.get("severe", 0) > 0.3:
+        for condition, info in scan["conditions"].items():
+            severe_prob = info["severe"]
+            if severe_prob > 0.3:
                 recommendations.append({
                     "priority": "high",
                     "type": "diagnostic",
-                    "recommendation": f"Evaluate for {condition.replace('_', ' ')} - consider specific diagnostic tests",
-                    "reasoning": f"High probability of severe {condition.replace('_', ' ')} ({condition_probs.get('severe', 0)*100:.1f}%)",
+                    "recommendation": f"Evaluate for {_CONDITION_TEXT[condition]} - consider specific diagnostic tests",
+                    "reasoning": f"High probability of severe {_CONDITION_TEXT[condition]} ({severe_prob*100:.1f}%)",
                     "confidence": confidence
                 })
         
@@ -342,28 +564,20 @@ class UncertaintyAnalysisService:
             return {"insufficient_data": True}
         
         # Get recent entries
-        recent_entries = self.diagnosis_history[-5:]
+        recent_entries = list(self.diagnosis_history)[-5:]
         
         # Analyze confidence trend
         confidence_scores = [entry.get("confidence", 0.5) for entry in recent_entries]
         confidence_trend = "improving" if confidence_scores[-1] > confidence_scores[0] else "declining"
         
-        # Analyze risk trend
-        risk_levels = []
-        for entry in recent_entries:
-            patient_status = entry.get("probabilities", {}).get("patient_status", {})
-            critical_prob = patient_status.get("critical", 0)
-            at_risk_prob = patient_status.get("at_risk", 0)
-            
-            if critical_prob > 0.4:
-                risk_levels.append(3)  # Critical
-            elif at_risk_prob > 0.4:
-                risk_levels.append(2)  # At risk
-            else:
-                risk_levels.append(1)  # Stable
-        
+        # Analyze risk trend from the integer levels stored at insertion
+        # time (3=critical, 2=at risk, 1=stable)
+        risk_levels = np.fromiter(
+            (entry["risk_level_int"] for entry in recent_entries),
+            dtype=np.int8, count=len(recent_entries))
+
         risk_trend = "stable"
-        if len(risk_levels) >= 2:
+        if risk_levels.size >= 2:
             if risk_levels[-1] > risk_levels[0]:
                 risk_trend = "deteriorating"
             elif risk_levels[-1] < risk_levels[0]:
@@ -407,30 +621,21 @@ class UncertaintyAnalysisService:
         
         explanation = self.bayesian_network.explain_reasoning(query_condition)
         
-        # Add additional context for medical interpretation
-        explanation["medical_context"] = {
-            "methodology": "Probabilistic reasoning using Bayesian Networks",
-            "uncertainty_management": "Accounts for sensor noise, measurement errors, and incomplete information",
-            "evidence_integration": "Combines multiple vital signs to assess medical conditions",
-            "dynamic_updates": "Probabilities update as new evidence becomes available"
-        }
-        
-        explanation["academic_significance"] = {
-            "ai_technique": "Bayesian Networks for uncertainty reasoning",
-            "domain_application": "Medical diagnosis and patient monitoring",
-            "key_advantages": [
-                "Handles uncertainty and incomplete data",
-                "Provides probabilistic confidence measures",
-                "Enables reasoning under uncertainty",
-                "Supports evidence-based decision making"
-            ]
-        }
+        # Add additional context for medical interpretation (static per model)
+        explanation["medical_context"] = _MEDICAL_CONTEXT
+        explanation["academic_significance"] = _ACADEMIC_SIGNIFICANCE
         
         return explanation
     
     def get_network_structure(self) -> Dict[str, Any]:
-        """Get the structure of the Bayesian Network for visualization"""
-        
+        """Get the structure of the Bayesian Network for visualization
+
+        The graph is immutable after construction, so the walk over nodes
+        and edges runs once and the built dict is reused afterwards.
+        """
+        if self._network_structure is not None:
+            return self._network_structure
+
         structure = {
             "nodes": {},
             "edges": [],
@@ -450,7 +655,8 @@ class UncertaintyAnalysisService:
                 structure["edges"].append({"from": parent, "to": node_name})
             
             structure["conditional_dependencies"][node_name] = node.parents
-        
+
+        self._network_structure = structure
         return structure
 
 # Global instance
@@ -1,22 +1,32 @@
 """
 Configuration settings for KogniCare application
 """
+import functools
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+# Parse the .env file only once per process - worker forks and subprocess
+# re-imports inherit the loaded environment through this sentinel
+if not os.environ.get('_KOGNI_DOTENV_LOADED'):
+    load_dotenv()
+    os.environ['_KOGNI_DOTENV_LOADED'] = '1'
+
+@functools.lru_cache(maxsize=None)
+def _envbool(name: str, default: str = 'false') -> bool:
+    """Memoized boolean environment flag lookup"""
+    return os.environ.get(name, default).lower() == 'true'
 
 class Config:
     """Base configuration"""
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
-    DEBUG = os.environ.get('DEBUG', 'False').lower() == 'true'
-    
+    DEBUG = _envbool('DEBUG')
+
     # AI Service Configuration
     OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY', '')
     AI_MODEL = os.environ.get('AI_MODEL', 'microsoft/phi-3.5-mini-128k-instruct')
-    
+
     # Simulation Configuration
-    DISABLE_SIMULATION = os.environ.get('DISABLE_SIMULATION', 'false').lower() == 'true'
+    DISABLE_SIMULATION = _envbool('DISABLE_SIMULATION')
     SIMULATION_INTERVAL_PROD = int(os.environ.get('SIMULATION_INTERVAL_PROD', '30'))  # seconds
     SIMULATION_INTERVAL_DEV = int(os.environ.get('SIMULATION_INTERVAL_DEV', '10'))   # seconds
     